@@ -39,7 +39,7 @@ class SlackHandler(AlertHandler):
             response = requests.post(self.webhook_url, json=payload, timeout=10)
             return response.status_code == 200
         except Exception as e:
-            self.logger.error(f"Error sending Slack alert: {e}")
+            self.logger.error("Error sending Slack alert: %s", e)
             return False
 
     @staticmethod
@@ -75,7 +75,7 @@ class EmailHandler(AlertHandler):
 
             return True
         except Exception as e:
-            self.logger.error(f"Error sending email alert: {e}")
+            self.logger.error("Error sending email alert: %s", e)
             return False
 
     @staticmethod
@@ -102,7 +102,7 @@ class WebhookHandler(AlertHandler):
             response = requests.post(self.webhook_url, json=alert, timeout=10)
             return response.status_code < 400
         except Exception as e:
-            self.logger.error(f"Error sending webhook alert: {e}")
+            self.logger.error("Error sending webhook alert: %s", e)
             return False
 
 
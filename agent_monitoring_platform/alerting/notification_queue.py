@@ -27,7 +27,7 @@ class NotificationQueue:
     def enqueue(self, notification: Notification) -> bool:
         # Check for deduplication
         if self._is_duplicate(notification.alert_id):
-            self.logger.debug(f"Skipping duplicate alert: {notification.alert_id}")
+            self.logger.debug("Skipping duplicate alert: %s", notification.alert_id)
             return False
 
         self.queue.append(notification)
@@ -56,7 +56,7 @@ class NotificationQueue:
                 n.retry_count += 1
                 if n.retry_count >= self.max_retries:
                     n.delivered = True
-                    self.logger.warning(f"Max retries reached for notification: {notification_id}")
+                    self.logger.warning("Max retries reached for notification: %s", notification_id)
                 return True
         return False
 
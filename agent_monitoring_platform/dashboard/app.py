@@ -17,7 +17,7 @@ st.caption("Session-aware telemetry for real agents and Groq-powered models.")
 with st.sidebar:
     st.header("Workspace")
     data_dir = st.text_input("Telemetry Directory", value="./real_agent_output")
-    st.caption("Point this to where metrics_*.json & events_*.json are exported.")
+    st.caption("Point this to where metrics.jsonl & events.jsonl are exported.")
 
 if not os.path.exists(data_dir):
     st.error(f"Directory not found: {data_dir}")
@@ -6,43 +6,67 @@ import pandas as pd
 from sessions import SessionManager
 
 
+def _read_jsonl(path):
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def _load_metric_exports(data_dir):
+    """Yield (timestamp, {metric name: metric data}) for every metrics export."""
+    exports = {}
+    for record in _read_jsonl(os.path.join(data_dir, "metrics.jsonl")):
+        exports.setdefault(record.get("timestamp"), {})[record.get("name")] = record
+    for timestamp, metrics in exports.items():
+        yield timestamp, metrics
+
+    # Snapshot files written by older exporter versions.
+    for fpath in glob.glob(os.path.join(data_dir, "metrics_*.json")):
+        try:
+            with open(fpath, 'r') as f:
+                data = json.load(f)
+            yield data.get("timestamp"), data.get("metrics", {})
+        except Exception as e:
+            print(f"Error loading {fpath}: {e}")
+
+
 def load_data(data_dir):
     """
-    Reads all JSON files from the directory and converts them into Pandas DataFrames.
+    Reads the exported metrics/events (metrics.jsonl, events.jsonl) and converts them into Pandas DataFrames.
     Returns: (metrics_df, events_df)
     """
     # 1. Load Metrics (The Scores)
-    metric_files = glob.glob(os.path.join(data_dir, "metrics_*.json"))
     metrics_data = []
 
-    for fpath in metric_files:
-        try:
-            with open(fpath, 'r') as f:
-                data = json.load(f)
-                timestamp = data.get("timestamp")
-                metrics = data.get("metrics", {})
-
-                # Extract key metrics if they exist
-                row = {"timestamp": timestamp, "file": os.path.basename(fpath)}
+    for timestamp, metrics in _load_metric_exports(data_dir):
+        # Extract key metrics if they exist
+        row = {"timestamp": timestamp}
 
-                if "agent_execution_duration" in metrics:
-                    values = metrics["agent_execution_duration"].get("values", [])
-                    if values:
-                        vals = [v['value'] for v in values]
-                        row["duration_ms"] = sum(vals) / len(vals)
+        if "agent_execution_duration" in metrics:
+            values = metrics["agent_execution_duration"].get("values", [])
+            if values:
+                vals = [v['value'] for v in values]
+                row["duration_ms"] = sum(vals) / len(vals)
 
-                if "llm_latency_ms" in metrics:
-                    values = metrics["llm_latency_ms"].get("values", [])
-                    if values:
-                        vals = [v['value'] for v in values]
-                        row["llm_latency_ms"] = sum(vals) / len(vals)
+        if "llm_latency_ms" in metrics:
+            values = metrics["llm_latency_ms"].get("values", [])
+            if values:
+                vals = [v['value'] for v in values]
+                row["llm_latency_ms"] = sum(vals) / len(vals)
 
-                if "agent_success_rate" in metrics:
-                    row["success_count"] = metrics["agent_success_rate"].get("total", 0)
+        if "agent_success_rate" in metrics:
+            row["success_count"] = metrics["agent_success_rate"].get("total", 0)
 
-                metrics_data.append(row)
-        except Exception as e:
-            print(f"Error loading {fpath}: {e}")
+        metrics_data.append(row)
 
     metrics_df = pd.DataFrame(metrics_data)
     if not metrics_df.empty:
@@ -50,22 +74,21 @@ def load_data(data_dir):
         metrics_df = metrics_df.sort_values("timestamp")
 
     # 2. Load Events
-    event_files = glob.glob(os.path.join(data_dir, "events_*.json"))
-    events_data = []
-
-    for fpath in event_files:
+    events_data = _read_jsonl(os.path.join(data_dir, "events.jsonl"))
+    for fpath in glob.glob(os.path.join(data_dir, "events_*.json")):
         try:
             with open(fpath, 'r') as f:
-                data = json.load(f)
-                for event in data.get("events", []):
-                    trace_id = event.get("context", {}).get("trace_id") or event.get("data", {}).get("trace_id")
-                    event["trace_id"] = trace_id
-                    events_data.append(event)
+                events_data.extend(json.load(f).get("events", []))
         except Exception as e:
             print(f"Error loading {fpath}: {e}")
 
+    for event in events_data:
+        event["trace_id"] = event.get("context", {}).get("trace_id") or event.get("data", {}).get("trace_id")
+
     events_df = pd.DataFrame(events_data)
     if not events_df.empty:
+        # Successive exports can repeat events that were already written.
+        events_df = events_df.drop_duplicates(subset="event_id", keep="last")
         events_df["timestamp"] = pd.to_datetime(events_df["timestamp"])
         events_df = events_df.sort_values("timestamp")
 
@@ -111,4 +134,5 @@ def load_session_runs(data_dir: str):
         runs_df = runs_df.sort_values("completed_at", ascending=False)
 
     summary = manager.get_cross_session_summary()
+    manager.close()
     return runs_df, summary
@@ -1,3 +1,4 @@
+from bisect import bisect_left, bisect_right
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import logging
@@ -17,14 +18,17 @@ class AnalyticsEngine:
         end_time: datetime,
         granularity: str = "1h",
     ) -> List[Dict[str, Any]]:
-        metrics = self.db_manager.get_metrics(metric_name=metric_name)
-        filtered = [m for m in metrics if start_time <= m.timestamp <= end_time]
+        metrics = sorted(self.db_manager.get_metrics(metric_name=metric_name), key=lambda m: m.timestamp)
+        timestamps = [m.timestamp for m in metrics]
 
         buckets = self._create_time_buckets(start_time, end_time, granularity)
         result = []
 
         for bucket_start, bucket_end in buckets:
-            bucket_data = [m for m in filtered if bucket_start <= m.timestamp <= bucket_end]
+            # Buckets are closed on both ends, as before; bisecting replaces a scan per bucket.
+            lo = bisect_left(timestamps, bucket_start)
+            hi = bisect_right(timestamps, bucket_end, lo=lo)
+            bucket_data = metrics[lo:hi]
             if bucket_data:
                 values = [m.value for m in bucket_data]
                 result.append({
@@ -2,7 +2,8 @@ from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, Text,
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
-import uuid
+
+from utils.helpers import sortable_id
 
 Base = declarative_base()
 
@@ -10,7 +11,7 @@ Base = declarative_base()
 class Agent(Base):
     __tablename__ = "agents"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=sortable_id)
     name = Column(String, nullable=False)
     version = Column(String, nullable=False)
     model_type = Column(String)
@@ -37,7 +38,7 @@ class Agent(Base):
 class AgentExecution(Base):
     __tablename__ = "agent_executions"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=sortable_id)
     agent_id = Column(String, ForeignKey("agents.id"), nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
     input = Column(Text)
@@ -90,7 +91,7 @@ class Metric(Base):
 class EvaluationRun(Base):
     __tablename__ = "evaluation_runs"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=sortable_id)
     benchmark_id = Column(String)
     timestamp = Column(DateTime, default=datetime.utcnow)
     status = Column(String)
@@ -111,7 +112,7 @@ class EvaluationRun(Base):
 class Alert(Base):
     __tablename__ = "alerts"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=sortable_id)
     rule_id = Column(String)
     timestamp = Column(DateTime, default=datetime.utcnow)
     severity = Column(String)
@@ -1,16 +1,37 @@
 from typing import Optional, Dict, Any, List
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
 from datetime import datetime, timedelta
 import logging
 
 from .data_models import Base, Agent, AgentExecution, Metric, EvaluationRun, Alert
 
+# WAL lets dashboard reads run alongside telemetry writes; NORMAL syncs once per
+# checkpoint instead of per commit, which WAL keeps crash-safe.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 class DatabaseManager:
     def __init__(self, database_url: str = "sqlite:///monitoring.db"):
         self.database_url = database_url
         self.engine = create_engine(database_url, echo=False)
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", _apply_sqlite_pragmas)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine, expire_on_commit=False)
         self.logger = logging.getLogger(__name__)
 
@@ -33,7 +54,7 @@ class DatabaseManager:
             )
             session.add(agent)
             session.commit()
-            self.logger.info(f"Agent added: {name} v{version}")
+            self.logger.info("Agent added: %s v%s", name, version)
             return agent
         finally:
             session.close()
@@ -81,7 +102,7 @@ class DatabaseManager:
             session.add(execution)
             session.commit()
             session.refresh(execution)
-            self.logger.info(f"Execution added for agent {agent_id}")
+            self.logger.info("Execution added for agent %s", agent_id)
             return execution
         finally:
             session.close()
@@ -113,6 +134,26 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def add_metrics(self, records: List[Dict[str, Any]]) -> int:
+        """Insert many metric rows in one session and one commit."""
+        if not records:
+            return 0
+        session = self.get_session()
+        try:
+            session.add_all([
+                Metric(
+                    execution_id=record.get("execution_id"),
+                    metric_name=record.get("metric_name"),
+                    value=record.get("value", 0),
+                    tags=record.get("tags") or {},
+                )
+                for record in records
+            ])
+            session.commit()
+            return len(records)
+        finally:
+            session.close()
+
     def get_metrics(self, metric_name: Optional[str] = None, limit: int = 1000) -> List[Metric]:
         session = self.get_session()
         try:
@@ -141,7 +182,7 @@ class DatabaseManager:
             session.add(eval_run)
             session.commit()
             session.refresh(eval_run)
-            self.logger.info(f"Evaluation run added: {benchmark_id}")
+            self.logger.info("Evaluation run added: %s", benchmark_id)
             return eval_run
         finally:
             session.close()
@@ -204,7 +245,7 @@ class DatabaseManager:
             session.query(Alert).filter(Alert.timestamp < cutoff_date).delete()
 
             session.commit()
-            self.logger.info(f"Cleaned up data older than {retention_days} days")
+            self.logger.info("Cleaned up data older than %s days", retention_days)
         finally:
             session.close()
 
@@ -223,7 +264,7 @@ class DatabaseManager:
             session.close()
 
     def backup(self, backup_path: str):
-        self.logger.info(f"Backing up database to {backup_path}")
+        self.logger.info("Backing up database to %s", backup_path)
 
     def close(self):
         self.engine.dispose()
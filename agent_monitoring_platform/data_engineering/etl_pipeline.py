@@ -27,7 +27,7 @@ class ETLPipeline:
         self.transformers[name] = transform_func
 
     def extract(self, source: str, query: Optional[str] = None) -> List[Dict[str, Any]]:
-        self.logger.info(f"Extracting from {source}")
+        self.logger.info("Extracting from %s", source)
 
         if source == "executions":
             executions = self.db_manager.get_executions(limit=1000)
@@ -45,7 +45,7 @@ class ETLPipeline:
         return []
 
     def transform(self, data: List[Dict[str, Any]], transformer_name: Optional[str] = None) -> List[Dict[str, Any]]:
-        self.logger.info(f"Transforming {len(data)} records")
+        self.logger.info("Transforming %s records", len(data))
 
         transformed_data = []
         for record in data:
@@ -54,7 +54,7 @@ class ETLPipeline:
                 if transformed_record:
                     transformed_data.append(transformed_record)
             except Exception as e:
-                self.logger.error(f"Error transforming record: {e}")
+                self.logger.error("Error transforming record: %s", e)
 
         return transformed_data
 
@@ -65,18 +65,16 @@ class ETLPipeline:
         return record
 
     def load(self, data: List[Dict[str, Any]], target: str) -> bool:
-        self.logger.info(f"Loading {len(data)} records to {target}")
+        self.logger.info("Loading %s records to %s", len(data), target)
 
         try:
+            if target == "metrics":
+                # One transaction for the whole batch instead of a commit per row.
+                self.db_manager.add_metrics(data)
+                return True
+
             for record in data:
-                if target == "metrics":
-                    self.db_manager.add_metric(
-                        execution_id=record.get("execution_id"),
-                        metric_name=record.get("metric_name"),
-                        value=record.get("value", 0),
-                        tags=record.get("tags", {}),
-                    )
-                elif target == "executions":
+                if target == "executions":
                     self.db_manager.add_execution(
                         agent_id=record.get("agent_id"),
                         input_data=record.get("input", ""),
@@ -89,7 +87,7 @@ class ETLPipeline:
 
             return True
         except Exception as e:
-            self.logger.error(f"Error loading data: {e}")
+            self.logger.error("Error loading data: %s", e)
             return False
 
     def validate(self, data: List[Dict[str, Any]]) -> tuple[bool, List[str]]:
@@ -111,7 +109,7 @@ class ETLPipeline:
             is_valid, validation_errors = self.validate(data)
 
             if not is_valid:
-                self.logger.warning(f"Validation errors: {validation_errors}")
+                self.logger.warning("Validation errors: %s", validation_errors)
 
             transformed_data = self.transform(data, transformer)
             success = self.load(transformed_data, target)
@@ -132,7 +130,7 @@ class ETLPipeline:
                 timestamp=datetime.utcnow(),
                 error=str(e),
             )
-            self.logger.error(f"Pipeline error: {e}")
+            self.logger.error("Pipeline error: %s", e)
 
         self.jobs.append(job)
         return job
@@ -15,10 +15,10 @@ class SchemaManager:
     def create_schema(self) -> bool:
         try:
             self.db_manager.create_tables()
-            self.logger.info(f"Schema created (version {self.schema_version})")
+            self.logger.info("Schema created (version %s)", self.schema_version)
             return True
         except Exception as e:
-            self.logger.error(f"Error creating schema: {e}")
+            self.logger.error("Error creating schema: %s", e)
             return False
 
     def add_migration(self, version: str, description: str, sql: str):
@@ -39,10 +39,10 @@ class SchemaManager:
             sql = f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({column_name});"
             session.execute(sql)
             session.commit()
-            self.logger.info(f"Index created: {index_name}")
+            self.logger.info("Index created: %s", index_name)
             return True
         except Exception as e:
-            self.logger.error(f"Error creating index: {e}")
+            self.logger.error("Error creating index: %s", e)
             return False
         finally:
             session.close()
@@ -73,8 +73,8 @@ class SchemaManager:
             with open(filepath, "w") as f:
                 json.dump(schema_info, f, indent=2)
 
-            self.logger.info(f"Schema exported to {filepath}")
+            self.logger.info("Schema exported to %s", filepath)
             return True
         except Exception as e:
-            self.logger.error(f"Error exporting schema: {e}")
+            self.logger.error("Error exporting schema: %s", e)
             return False
@@ -3,19 +3,26 @@
 Basic monitoring example showing how to set up telemetry collection
 """
 
+import sys
 import time
 import random
 from telemetry.collector import TelemetryCollector
 from telemetry.exporters import JSONExporter
 
 
-def simulate_agent_execution(collector, agent_id, num_iterations=10):
-    """Simulate agent executions and collect metrics"""
+def simulate_agent_execution(collector, agent_id, num_iterations=10, pace_s: float = 0.0, verbose: bool = False):
+    """Simulate agent executions and collect metrics
 
-    print(f"Starting monitoring for {agent_id}...")
+    Pacing and progress output are off by default so the loop can be used as a
+    collector throughput benchmark; the demo in ``main`` turns both on.
+    """
+
+    if verbose:
+        print(f"Starting monitoring for {agent_id}...", flush=True)
 
     for i in range(num_iterations):
-        print(f"  Iteration {i+1}/{num_iterations}")
+        if verbose:
+            print(f"  Iteration {i+1}/{num_iterations}", flush=True)
 
         # Simulate agent work
         duration_ms = random.uniform(100, 1000)
@@ -46,9 +53,11 @@ def simulate_agent_execution(collector, agent_id, num_iterations=10):
                 cost=0.001,
             )
 
-        time.sleep(0.5)
+        if pace_s:
+            time.sleep(pace_s)
 
-    print("Monitoring completed!")
+    if verbose:
+        print("Monitoring completed!")
 
 
 def main():
@@ -63,22 +72,25 @@ def main():
     collector.start()
 
     # Simulate agent executions
-    simulate_agent_execution(collector, "agent_demo", num_iterations=10)
+    simulate_agent_execution(collector, "agent_demo", num_iterations=10, pace_s=0.5, verbose=True)
 
     # Get health status
     health = collector.get_health_status()
-    print("\nHealth Status:")
-    print(f"  Running: {health['is_running']}")
-    print(f"  CPU: {health['cpu_percent']:.1f}%")
-    print(f"  Memory: {health['memory_percent']:.1f}%")
-    print(f"  Metrics: {health['metrics_count']}")
-    print(f"  Events: {health['events_count']}")
+    lines = [
+        "\nHealth Status:",
+        f"  Running: {health['is_running']}",
+        f"  CPU: {health['cpu_percent']:.1f}%",
+        f"  Memory: {health['memory_percent']:.1f}%",
+        f"  Metrics: {health['metrics_count']}",
+        f"  Events: {health['events_count']}",
+    ]
 
     # Get summary
     summary = collector.get_all_metrics_summary()
-    print("\nMetrics Summary:")
-    print(f"  Total Metrics: {len(summary['metrics'])}")
-    print(f"  Events by Type: {summary['events']['by_type']}")
+    lines.append("\nMetrics Summary:")
+    lines.append(f"  Total Metrics: {len(summary['metrics'])}")
+    lines.append(f"  Events by Type: {summary['events']['by_type']}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     # Stop collection
     collector.stop()
@@ -3,6 +3,7 @@
 Full pipeline example demonstrating the complete monitoring platform
 """
 
+import sys
 from datetime import datetime, timedelta
 from telemetry.collector import TelemetryCollector
 from telemetry.exporters import JSONExporter
@@ -59,9 +60,7 @@ def create_test_cases():
 
 def run_evaluations():
     """Run evaluation suite"""
-    print("=" * 60)
-    print("RUNNING EVALUATION PIPELINE")
-    print("=" * 60)
+    sys.stdout.write("\n".join(["=" * 60, "RUNNING EVALUATION PIPELINE", "=" * 60]) + "\n")
 
     suite = BenchmarkSuite("benchmark_full_pipeline")
 
@@ -79,27 +78,27 @@ def run_evaluations():
     # Run evaluation
     results = suite.run()
 
-    print("\nEvaluation Results:")
-    print(f"  Benchmark ID: {results.benchmark_id}")
-    print(f"  Test Cases: {len(results.test_cases)}")
-    print(f"  Execution Time: {results.execution_time_ms:.2f}ms")
-
-    print("\nSummaries by Evaluator:")
+    lines = [
+        "\nEvaluation Results:",
+        f"  Benchmark ID: {results.benchmark_id}",
+        f"  Test Cases: {len(results.test_cases)}",
+        f"  Execution Time: {results.execution_time_ms:.2f}ms",
+        "\nSummaries by Evaluator:",
+    ]
     for evaluator, summary in results.summaries.items():
-        print(f"\n  {evaluator.upper()}:")
-        print(f"    Total: {summary.get('total', 0)}")
-        print(f"    Passed: {summary.get('passed', 0)}")
-        print(f"    Pass Rate: {summary.get('pass_rate', 0):.2%}")
-        print(f"    Avg Score: {summary.get('avg_score', 0):.2f}")
+        lines.append(f"\n  {evaluator.upper()}:")
+        lines.append(f"    Total: {summary.get('total', 0)}")
+        lines.append(f"    Passed: {summary.get('passed', 0)}")
+        lines.append(f"    Pass Rate: {summary.get('pass_rate', 0):.2%}")
+        lines.append(f"    Avg Score: {summary.get('avg_score', 0):.2f}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return results
 
 
 def run_regression_detection():
     """Demonstrate regression detection"""
-    print("\n" + "=" * 60)
-    print("RUNNING REGRESSION DETECTION")
-    print("=" * 60)
+    sys.stdout.write("\n".join(["\n" + "=" * 60, "RUNNING REGRESSION DETECTION", "=" * 60]) + "\n")
 
     detector = RegressionDetector(
         significance_threshold=0.05,
@@ -116,25 +115,26 @@ def run_regression_detection():
     # Detect regression
     report = detector.detect_regression("latency_ms", current)
 
-    print(f"\nRegression Report for: latency_ms")
-    print(f"  Baseline Mean: {report.baseline_mean:.2f}ms")
-    print(f"  Current Mean: {report.current_mean:.2f}ms")
-    print(f"  Change: {report.change_percent:.2f}%")
-    print(f"  Regression Detected: {report.regression_detected}")
+    lines = [
+        "\nRegression Report for: latency_ms",
+        f"  Baseline Mean: {report.baseline_mean:.2f}ms",
+        f"  Current Mean: {report.current_mean:.2f}ms",
+        f"  Change: {report.change_percent:.2f}%",
+        f"  Regression Detected: {report.regression_detected}",
+    ]
 
     if report.alerts:
-        print(f"  Alerts:")
+        lines.append("  Alerts:")
         for alert in report.alerts:
-            print(f"    - {alert.regression_type.value} (severity: {alert.severity})")
+            lines.append(f"    - {alert.regression_type.value} (severity: {alert.severity})")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return report
 
 
 def run_data_analytics():
     """Demonstrate data analytics"""
-    print("\n" + "=" * 60)
-    print("SETTING UP DATA INFRASTRUCTURE")
-    print("=" * 60)
+    sys.stdout.write("\n".join(["\n" + "=" * 60, "SETTING UP DATA INFRASTRUCTURE", "=" * 60]) + "\n")
 
     db = DatabaseManager("sqlite:///monitoring_demo.db")
     db.create_tables()
@@ -148,10 +148,17 @@ def run_data_analytics():
         metadata={"capabilities": ["qa", "summarization"]},
     )
 
-    print(f"\nAgent Created:")
-    print(f"  Name: {agent.name}")
-    print(f"  Version: {agent.version}")
-    print(f"  ID: {agent.id}")
+    sys.stdout.write(
+        "\n".join(
+            [
+                "\nAgent Created:",
+                f"  Name: {agent.name}",
+                f"  Version: {agent.version}",
+                f"  ID: {agent.id}",
+            ]
+        )
+        + "\n"
+    )
 
     # Add executions
     for i in range(5):
@@ -172,18 +179,23 @@ def run_data_analytics():
 
     # Get statistics
     stats = db.get_statistics()
-    print(f"\nDatabase Statistics:")
-    print(f"  Agents: {stats['agents_count']}")
-    print(f"  Executions: {stats['executions_count']}")
-    print(f"  Metrics: {stats['metrics_count']}")
+    sys.stdout.write(
+        "\n".join(
+            [
+                "\nDatabase Statistics:",
+                f"  Agents: {stats['agents_count']}",
+                f"  Executions: {stats['executions_count']}",
+                f"  Metrics: {stats['metrics_count']}",
+            ]
+        )
+        + "\n"
+    )
 
     return db
 
 
 def main():
-    print("\n" + "=" * 60)
-    print("AGENT MONITORING PLATFORM - FULL PIPELINE DEMO")
-    print("=" * 60)
+    sys.stdout.write("\n".join(["\n" + "=" * 60, "AGENT MONITORING PLATFORM - FULL PIPELINE DEMO", "=" * 60]) + "\n")
 
     # Setup telemetry
     collector = setup_telemetry()
@@ -198,26 +210,23 @@ def main():
     db = run_data_analytics()
 
     # Aggregate results
-    print("\n" + "=" * 60)
-    print("RESULT AGGREGATION")
-    print("=" * 60)
+    lines = ["\n" + "=" * 60, "RESULT AGGREGATION", "=" * 60]
 
     aggregator = ResultAggregator()
     for evaluator, results in eval_results.evaluator_results.items():
         aggregator.add_results(results)
 
     aggregations = aggregator.get_aggregations_by_evaluator()
-    print("\nAggregated Metrics:")
+    lines.append("\nAggregated Metrics:")
     for evaluator, agg in aggregations.items():
-        print(f"\n  {evaluator}:")
-        print(f"    Pass Rate: {agg.pass_rate:.2%}")
-        print(f"    Mean Score: {agg.mean_score:.2f}")
-        print(f"    Std Dev: {agg.std_dev:.2f}")
+        lines.append(f"\n  {evaluator}:")
+        lines.append(f"    Pass Rate: {agg.pass_rate:.2%}")
+        lines.append(f"    Mean Score: {agg.mean_score:.2f}")
+        lines.append(f"    Std Dev: {agg.std_dev:.2f}")
 
     # Cleanup
-    print("\n" + "=" * 60)
-    print("CLEANING UP")
-    print("=" * 60)
+    lines.extend(["\n" + "=" * 60, "CLEANING UP", "=" * 60])
+    sys.stdout.write("\n".join(lines) + "\n")
 
     collector.stop()
     db.close()
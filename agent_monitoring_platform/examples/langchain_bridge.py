@@ -1,4 +1,7 @@
+import logging
 import time
+from collections import OrderedDict
+from itertools import islice
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
@@ -10,6 +13,9 @@ from langchain_classic.schema import LLMResult
 from telemetry.collector import TelemetryCollector
 from sessions import SessionManager
 
+# Shared read-only fallback for missing LLM output sections; never mutate.
+_EMPTY: Dict[str, Any] = {}
+
 
 class AgentMonitoringCallback(BaseCallbackHandler):
     """Bridge LangChain callbacks into the Agent Monitoring Platform."""
@@ -20,13 +26,20 @@ class AgentMonitoringCallback(BaseCallbackHandler):
         agent_name: str,
         session_manager: Optional[SessionManager] = None,
         session_id: Optional[str] = None,
+        max_runs: int = 1024,
+        run_ttl_s: float = 300.0,
     ):
         self.collector = collector
         self.agent_name = agent_name
         self.session_manager = session_manager
         self.session_id = session_id
-        self.runs: Dict[UUID, Dict[str, Any]] = {}
+        # LLM call details are only consumed by session runs, so skip collecting them otherwise.
+        self._session_enabled = session_manager is not None and session_id is not None
+        self.runs: "OrderedDict[UUID, Dict[str, Any]]" = OrderedDict()
+        self._max_runs = max_runs
+        self._run_ttl_s = run_ttl_s
         self._llm_calls: List[Dict[str, Any]] = []
+        self.logger = logging.getLogger(__name__)
 
     # ------------------------------------------------------------------
     # LangChain lifecycle events
@@ -41,7 +54,7 @@ class AgentMonitoringCallback(BaseCallbackHandler):
         **kwargs: Any,
     ) -> Any:
         if parent_run_id is None:
-            self.runs[run_id] = {"start_time": time.time(), "type": "agent", "inputs": inputs}
+            self._track_run(run_id, {"start_time": time.time(), "type": "agent", "inputs": inputs})
 
     def on_chain_end(
         self,
@@ -106,7 +119,7 @@ class AgentMonitoringCallback(BaseCallbackHandler):
         parent_run_id: Optional[UUID] = None,
         **kwargs: Any,
     ) -> Any:
-        self.runs[run_id] = {"start_time": time.time(), "type": "llm"}
+        self._track_run(run_id, {"start_time": time.time(), "type": "llm"})
 
     def on_llm_end(
         self,
@@ -121,11 +134,14 @@ class AgentMonitoringCallback(BaseCallbackHandler):
             return
 
         latency_ms = (time.time() - run_state["start_time"]) * 1000
-        token_usage = response.llm_output.get("token_usage", {}) if response.llm_output else {}
+        # Results served from the LLM cache carry no provider output block.
+        cache_hit = response.llm_output is None
+        llm_output = response.llm_output or _EMPTY
+        token_usage = llm_output.get("token_usage") or _EMPTY
         prompt_tokens = token_usage.get("prompt_tokens", 0)
         completion_tokens = token_usage.get("completion_tokens", 0)
         total_tokens = token_usage.get("total_tokens", 0)
-        model_name = response.llm_output.get("model_name", "unknown-model") if response.llm_output else "unknown-model"
+        model_name = llm_output.get("model_name", "unknown-model")
 
         self.collector.record_llm_call(
             model=model_name,
@@ -133,18 +149,21 @@ class AgentMonitoringCallback(BaseCallbackHandler):
             completion_tokens=completion_tokens,
             latency_ms=latency_ms,
             cost=total_tokens * 0.00002,
+            cache_hit=cache_hit,
         )
 
-        self._llm_calls.append(
-            {
-                "model": model_name,
-                "latency_ms": latency_ms,
-                "prompt_tokens": prompt_tokens,
-                "completion_tokens": completion_tokens,
-                "total_tokens": total_tokens,
-                "provider": "groq" if "grok" in model_name.lower() or "groq" in model_name.lower() else None,
-            }
-        )
+        if self._session_enabled:
+            self._llm_calls.append(
+                {
+                    "model": model_name,
+                    "latency_ms": latency_ms,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": total_tokens,
+                    "cache_hit": cache_hit,
+                    "provider": "groq" if "grok" in model_name.lower() or "groq" in model_name.lower() else None,
+                }
+            )
         print(f"🤖 [Bridge] Recorded LLM Call: {latency_ms:.2f}ms ({total_tokens} tokens)")
         self.runs.pop(run_id, None)
 
@@ -157,7 +176,9 @@ class AgentMonitoringCallback(BaseCallbackHandler):
         parent_run_id: Optional[UUID] = None,
         **kwargs: Any,
     ) -> Any:
-        self.runs[run_id] = {"start_time": time.time(), "type": "tool", "name": serialized.get("name", "unknown_tool")}
+        self._track_run(
+            run_id, {"start_time": time.time(), "type": "tool", "name": serialized.get("name", "unknown_tool")}
+        )
 
     def on_tool_end(
         self,
@@ -180,6 +201,31 @@ class AgentMonitoringCallback(BaseCallbackHandler):
         print(f"🛠️ [Bridge] Recorded Tool Usage: {run_state.get('name')} ({duration_ms:.2f}ms)")
         self.runs.pop(run_id, None)
 
+    # ------------------------------------------------------------------
+    # Run bookkeeping
+    # ------------------------------------------------------------------
+    def _track_run(self, run_id: UUID, state: Dict[str, Any]):
+        """Register an in-flight run, evicting runs whose end callback never fired."""
+        self.runs[run_id] = state
+
+        # Entries are kept in start order, so the oldest go first when over capacity.
+        while len(self.runs) > self._max_runs:
+            oldest_id, oldest = self.runs.popitem(last=False)
+            self.logger.debug("Evicted %s run %s to stay within max_runs", oldest["type"], oldest_id)
+
+        # Agent roots legitimately outlive the TTL while their children keep running, so
+        # only child runs age out; an orphaned root is dropped by the capacity bound above.
+        cutoff = state["start_time"] - self._run_ttl_s
+        stale = []
+        for tracked_id, tracked in self.runs.items():
+            if tracked["start_time"] >= cutoff:
+                break
+            if tracked["type"] != "agent":
+                stale.append(tracked_id)
+        for tracked_id in stale:
+            tracked = self.runs.pop(tracked_id)
+            self.logger.debug("Evicted orphaned %s run %s (no end/error callback received)", tracked["type"], tracked_id)
+
     # ------------------------------------------------------------------
     # Session management helpers
     # ------------------------------------------------------------------
@@ -197,7 +243,8 @@ class AgentMonitoringCallback(BaseCallbackHandler):
 
         events_snapshot = []
         if self.collector and self.collector.event_emitter:
-            events_snapshot = [event.to_dict() for event in self.collector.event_emitter.get_events()][-50:]
+            recent = list(islice(reversed(self.collector.event_emitter.get_events()), 50))
+            events_snapshot = [event.to_dict() for event in reversed(recent)]
 
         llm_summary = self._llm_calls[-1] if self._llm_calls else {}
         metrics = {"duration_ms": duration_ms}
@@ -208,7 +255,12 @@ class AgentMonitoringCallback(BaseCallbackHandler):
             avg_latency = sum(call["latency_ms"] for call in self._llm_calls) / len(self._llm_calls)
             metrics["avg_llm_latency_ms"] = avg_latency
 
-        lineage = {"llm": list(self._llm_calls)} if self._llm_calls else None
+        # Hand the accumulated calls over to the run instead of copying them.
+        if self._llm_calls:
+            lineage = {"llm": self._llm_calls}
+            self._llm_calls = []
+        else:
+            lineage = None
 
         self.session_manager.record_run(
             session_id=self.session_id,
@@ -224,4 +276,3 @@ class AgentMonitoringCallback(BaseCallbackHandler):
             tags={"bridge": "langchain", "source": "AgentMonitoringCallback"},
             lineage=lineage,
         )
-        self._llm_calls.clear()
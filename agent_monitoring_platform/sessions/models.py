@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from utils.helpers import DATACLASS_SLOTS
+
 
 def _utcnow() -> datetime:
     return datetime.utcnow()
@@ -20,6 +23,11 @@ def _parse_datetime(value: Optional[Any]) -> Optional[datetime]:
         return None
 
 
+def _intern(value: Optional[Any]) -> Optional[Any]:
+    """Intern short identifier strings that repeat across many runs."""
+    return sys.intern(value) if type(value) is str else value
+
+
 def _trim_text(text: Optional[Any], limit: int = 500) -> Optional[str]:
     if text is None:
         return None
@@ -29,7 +37,7 @@ def _trim_text(text: Optional[Any], limit: int = 500) -> Optional[str]:
     return text[: limit - 3] + "..."
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SessionRun:
     """Represents a single agent run that belongs to a monitoring session."""
 
@@ -49,6 +57,14 @@ class SessionRun:
     tags: Dict[str, Any] = field(default_factory=dict)
     parent_run_id: Optional[str] = None
     lineage: Dict[str, Any] = field(default_factory=dict)
+    # Serialized form of a completed run; runs are treated as immutable once completed.
+    _frozen_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.agent_id = _intern(self.agent_id)
+        self.status = _intern(self.status)
+        self.model = _intern(self.model)
+        self.provider = _intern(self.provider)
 
     def duration_ms(self) -> Optional[float]:
         if not self.completed_at:
@@ -56,7 +72,10 @@ class SessionRun:
         return (self.completed_at - self.started_at).total_seconds() * 1000
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        """Serialize the run; the result is cached once the run is completed and must not be mutated."""
+        if self._frozen_dict is not None:
+            return self._frozen_dict
+        payload = {
             "run_id": self.run_id,
             "session_id": self.session_id,
             "agent_id": self.agent_id,
@@ -74,6 +93,9 @@ class SessionRun:
             "parent_run_id": self.parent_run_id,
             "lineage": self.lineage,
         }
+        if self.completed_at is not None:
+            self._frozen_dict = payload
+        return payload
 
     @classmethod
     def from_dict(cls, payload: Dict[str, Any]) -> "SessionRun":
@@ -137,7 +159,7 @@ class SessionRun:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SessionRecord:
     """Envelope that groups multiple agent runs under a single monitoring session."""
 
@@ -151,6 +173,13 @@ class SessionRecord:
     tags: Dict[str, Any] = field(default_factory=dict)
     runs: List[SessionRun] = field(default_factory=list)
     parent_session_id: Optional[str] = None
+    # Totals for the oldest runs, which have been moved out of memory to the run archive.
+    archived_runs: int = 0
+    archived_success_runs: int = 0
+
+    def __post_init__(self):
+        self.agent_id = _intern(self.agent_id)
+        self.status = _intern(self.status)
 
     def add_run(self, run: SessionRun):
         self.runs.append(run)
@@ -160,8 +189,19 @@ class SessionRecord:
         self.status = status
         self.updated_at = _utcnow()
 
+    def archive_oldest_runs(self, count: int) -> List[SessionRun]:
+        """Drop the ``count`` oldest runs from memory, keeping them in the archived totals."""
+        evicted = self.runs[:count]
+        del self.runs[:count]
+        for run in evicted:
+            self.archived_runs += 1
+            if run.status == "completed" and not run.error:
+                self.archived_success_runs += 1
+        return evicted
+
     def success_runs(self) -> int:
-        return len([run for run in self.runs if run.status == "completed" and not run.error])
+        retained = len([run for run in self.runs if run.status == "completed" and not run.error])
+        return self.archived_success_runs + retained
 
     def total_duration_ms(self) -> float:
         durations = [run.duration_ms() for run in self.runs if run.duration_ms()]
@@ -178,6 +218,8 @@ class SessionRecord:
             "status": self.status,
             "tags": self.tags,
             "parent_session_id": self.parent_session_id,
+            "archived_runs": self.archived_runs,
+            "archived_success_runs": self.archived_success_runs,
             "runs": [run.to_dict() for run in self.runs],
         }
 
@@ -195,4 +237,6 @@ class SessionRecord:
             tags=payload.get("tags") or {},
             runs=[SessionRun.from_dict(run_payload) for run_payload in runs_payload],
             parent_session_id=payload.get("parent_session_id"),
+            archived_runs=payload.get("archived_runs", 0),
+            archived_success_runs=payload.get("archived_success_runs", 0),
         )
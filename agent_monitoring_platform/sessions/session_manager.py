@@ -1,34 +1,216 @@
 from __future__ import annotations
 
-import json
-import uuid
+import atexit
+import functools
+import itertools
+import logging
+import os
+import queue
+import weakref
+from bisect import bisect_left, insort
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from threading import Lock
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from threading import Event, Lock, Thread
+from typing import IO, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
-from .models import SessionRecord, SessionRun
+import numpy as np
+import orjson
+
+from utils.config import Config
+from utils.helpers import fast_id, sortable_id
+
+from .models import SessionRecord, SessionRun, _parse_datetime
+
+
+# Writer-queue markers; everything else on the queue is a serialized log line or an
+# _ArchiveWrite.
+_COMPACT = object()
+_STOP = object()
+
+# Run metrics and tags are caller-supplied, so non-string keys are allowed.
+_LOG_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+
+class _ArchiveWrite(NamedTuple):
+    """Evicted runs for ``archive/<session_id>.jsonl`` plus the log line recording it."""
+
+    session_id: str
+    runs: bytes
+    line: bytes
+
+
+def _dump_line(payload: Dict[str, Any]) -> bytes:
+    return orjson.dumps(payload, option=_LOG_OPTIONS)
+
+# Managers whose writer thread may still hold queued writes. The writer is a daemon
+# thread, so it is closed from an atexit hook rather than being killed mid-batch.
+_LIVE_MANAGERS: "weakref.WeakSet[SessionManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_live_managers():
+    for manager in list(_LIVE_MANAGERS):
+        manager.close()
 
 
 def _utcnow() -> datetime:
     return datetime.utcnow()
 
 
+def _run_duration_ms(run: SessionRun) -> Optional[float]:
+    """Duration reported by the caller, falling back to the run timestamps."""
+    reported = run.metrics.get("duration_ms") if run.metrics else None
+    if reported is not None:
+        return float(reported)
+    return run.duration_ms()
+
+
+class _RunTotals:
+    """Running aggregates behind ``get_cross_session_summary``.
+
+    Durations live in a contiguous float64 buffer (grown by doubling) so the summary
+    statistics are computed by NumPy instead of a per-run Python loop. Archived runs
+    keep counting towards the run totals, but their durations are dropped on eviction,
+    so the duration statistics always cover exactly the runs held in memory, the same
+    set an index rebuild after a restart sees.
+    """
+
+    __slots__ = ("runs", "success_runs", "_durations", "_owners", "_slots")
+
+    def __init__(self):
+        self.runs = 0
+        self.success_runs = 0
+        self._durations = np.empty(64, dtype=np.float64)
+        # Run stored in each buffer slot, and id(run) -> slot, for O(1) swap-removal.
+        self._owners: List[SessionRun] = []
+        self._slots: Dict[int, int] = {}
+
+    def add(self, run: SessionRun):
+        self.runs += 1
+        if run.status == "completed" and not run.error:
+            self.success_runs += 1
+        duration = _run_duration_ms(run)
+        if duration is not None:
+            count = len(self._owners)
+            if count == self._durations.size:
+                grown = np.empty(self._durations.size * 2, dtype=np.float64)
+                grown[:count] = self._durations
+                self._durations = grown
+            self._durations[count] = duration
+            self._slots[id(run)] = count
+            self._owners.append(run)
+
+    def discard_duration(self, run: SessionRun):
+        """Forget an evicted run's duration by moving the last sample into its slot."""
+        slot = self._slots.pop(id(run), None)
+        if slot is None:
+            return
+        last = len(self._owners) - 1
+        if slot != last:
+            moved = self._owners[last]
+            self._durations[slot] = self._durations[last]
+            self._owners[slot] = moved
+            self._slots[id(moved)] = slot
+        self._owners.pop()
+
+    def add_archived(self, session: SessionRecord):
+        self.runs += session.archived_runs
+        self.success_runs += session.archived_success_runs
+
+    @property
+    def duration_count(self) -> int:
+        return len(self._owners)
+
+    @property
+    def durations(self) -> np.ndarray:
+        return self._durations[: len(self._owners)]
+
+
+def _encode_run(run: SessionRun) -> bytes:
+    """Serialize a run before it is recorded, so bad payloads fail in the caller."""
+    return orjson.dumps(run.to_dict(), option=orjson.OPT_NON_STR_KEYS)
+
+
+def _after_load(method):
+    """Block the wrapped public method until the background load has finished."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._loaded.wait()
+        if self._load_error is not None:
+            raise RuntimeError(f"Session log {self.storage_file} could not be loaded") from self._load_error
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+# (finished_at, insertion seq, session, run); the seq keeps ties from comparing objects.
+_RunIndexEntry = Tuple[datetime, int, SessionRecord, SessionRun]
+
+
 class SessionManager:
-    """Lightweight session store for coordinating cross-session agent runs."""
+    """Lightweight session store for coordinating cross-session agent runs.
+
+    ``sessions.jsonl`` is an append-only log: compacted lines hold a full session
+    snapshot, and every later change is appended as a small ``op`` delta. The log is
+    rewritten as snapshots once it grows to ``compact_factor`` times its size after
+    the previous compaction.
+
+    Each session keeps at most ``max_runs_per_session`` runs in memory; older runs are
+    appended to ``archive/<session_id>.jsonl`` and only their totals are kept.
 
-    def __init__(self, storage_dir: str = "./real_agent_output/sessions", retention_days: int = 45):
+    Writes happen on a background thread: mutating calls update the in-memory state
+    and enqueue the delta, so callers never wait on disk. Use ``flush()`` to wait
+    until everything queued so far is on disk. The same thread loads the existing
+    log first, so construction returns immediately and the first call that needs
+    the sessions waits for the load instead.
+    """
+
+    def __init__(
+        self,
+        storage_dir: str = "./real_agent_output/sessions",
+        retention_days: int = 45,
+        compact_factor: float = 4.0,
+        min_compact_bytes: int = 1 << 20,
+        write_batch_size: int = 64,
+        max_runs_per_session: Optional[int] = None,
+    ):
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self.storage_file = self.storage_dir / "sessions.jsonl"
+        self.archive_dir = self.storage_dir / "archive"
         self.retention_days = retention_days
+        self.compact_factor = compact_factor
+        self.min_compact_bytes = min_compact_bytes
         self._lock = Lock()
         self._sessions: Dict[str, SessionRecord] = {}
-        self._load_sessions()
+        self._log_handle: Optional[IO[bytes]] = None
+        self._compacted_size = 0
+        self.write_batch_size = write_batch_size
+        self.max_runs_per_session = max_runs_per_session or Config.MAX_RUNS_PER_SESSION
+        self.logger = logging.getLogger(__name__)
+
+        # Runs ordered by finish time (globally and per agent) plus running totals, so
+        # recent-run and summary queries never rescan every session.
+        self._run_seq = itertools.count()
+        self._runs_by_time: List[_RunIndexEntry] = []
+        self._runs_by_agent: Dict[str, List[_RunIndexEntry]] = defaultdict(list)
+        self._totals = _RunTotals()
+        self._totals_by_agent: Dict[str, _RunTotals] = defaultdict(_RunTotals)
+        self._sessions_by_agent: Dict[str, List[str]] = defaultdict(list)
+
+        self._write_queue: "queue.Queue[Any]" = queue.Queue()
+        self._loaded = Event()
+        self._load_error: Optional[BaseException] = None
+        self._writer_thread = Thread(target=self._writer_loop, name="session-writer", daemon=True)
+        self._writer_thread.start()
+        _LIVE_MANAGERS.add(self)
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
+    @_after_load
     def start_session(
         self,
         *,
@@ -38,7 +220,7 @@ class SessionManager:
         tags: Optional[Dict[str, Any]] = None,
         parent_session_id: Optional[str] = None,
     ) -> SessionRecord:
-        session_id = str(uuid.uuid4())
+        session_id = sortable_id()
         record = SessionRecord(
             session_id=session_id,
             agent_id=agent_id,
@@ -47,11 +229,15 @@ class SessionManager:
             tags=tags or {},
             parent_session_id=parent_session_id,
         )
+        # Serialize up front so an unencodable tag raises here instead of on the writer.
+        line = _dump_line({"op": "start_session", "session": record.to_dict()})
         with self._lock:
             self._sessions[session_id] = record
-            self._persist_locked()
+            self._sessions_by_agent[agent_id].append(session_id)
+            self._write_queue.put(line)
         return record
 
+    @_after_load
     def fork_session(
         self,
         parent_session_id: str,
@@ -76,15 +262,28 @@ class SessionManager:
             parent_session_id=parent_session_id,
         )
 
+    @_after_load
     def close_session(self, session_id: str, status: str = "completed") -> Optional[SessionRecord]:
         with self._lock:
             session = self._sessions.get(session_id)
             if not session:
                 return None
             session.complete(status)
-            self._persist_locked()
-            return session
+            self._write_queue.put(
+                _dump_line(
+                    {
+                        "op": "close_session",
+                        "session_id": session_id,
+                        "status": status,
+                        "updated_at": session.updated_at.isoformat(),
+                    }
+                )
+            )
+        # Closing is a natural checkpoint, so make the session durable before returning.
+        self.flush()
+        return session
 
+    @_after_load
     def record_run(
         self,
         session_id: str,
@@ -108,18 +307,16 @@ class SessionManager:
             session = self._sessions.get(session_id)
             if not session:
                 raise ValueError(f"Session {session_id} not found")
-
-            run = SessionRun.build(
-                run_id=str(uuid.uuid4()),
-                session_id=session_id,
-                agent_id=agent_id or session.agent_id,
+            run = self._build_run(
+                session,
+                agent_id=agent_id,
                 status=status,
                 input_payload=input_payload,
                 output_payload=output_payload,
                 model=model,
                 provider=provider,
-                started_at=started_at or _utcnow(),
-                completed_at=completed_at or _utcnow(),
+                started_at=started_at,
+                completed_at=completed_at,
                 metrics=metrics,
                 events=events,
                 error=error,
@@ -127,59 +324,73 @@ class SessionManager:
                 parent_run_id=parent_run_id,
                 lineage=lineage,
             )
-            if run.completed_at is None:
-                run.completed_at = _utcnow()
+            return self._apply_run_locked(session, run, _encode_run(run))
 
-            session.add_run(run)
-            self._persist_locked()
-            return run
+    @_after_load
+    def record_runs(self, runs: Iterable[Dict[str, Any]]) -> List[SessionRun]:
+        """Record many runs under one lock acquisition.
+
+        Each item holds ``record_run`` keyword arguments including ``session_id``.
+        Every run is built and serialized before any is applied, so a batch naming an
+        unknown session (``ValueError``) or carrying bad arguments or unencodable
+        payloads raises without recording anything.
+        """
+        with self._lock:
+            batch = []
+            for fields in runs:
+                fields = dict(fields)
+                session_id = fields.pop("session_id")
+                session = self._sessions.get(session_id)
+                if not session:
+                    raise ValueError(f"Session {session_id} not found")
+                run = self._build_run(session, **fields)
+                batch.append((session, run, _encode_run(run)))
+            return [self._apply_run_locked(session, run, encoded) for session, run, encoded in batch]
 
+    @_after_load
     def get_session(self, session_id: str) -> Optional[SessionRecord]:
         return self._sessions.get(session_id)
 
+    @_after_load
     def list_sessions(self, agent_id: Optional[str] = None) -> List[SessionRecord]:
-        sessions = [s for s in self._sessions.values() if not agent_id or s.agent_id == agent_id]
+        sessions = self._agent_sessions(agent_id) if agent_id else list(self._sessions.values())
+        # Sessions are indexed in creation order, so this sort is a near-linear reversal.
         return sorted(sessions, key=lambda s: s.created_at, reverse=True)
 
+    @_after_load
     def get_recent_runs(
         self, *, agent_id: Optional[str] = None, limit: int = 20
     ) -> List[Tuple[SessionRecord, SessionRun]]:
-        runs: List[Tuple[SessionRecord, SessionRun]] = []
-        for session in self.list_sessions(agent_id=agent_id):
-            for run in session.runs:
-                runs.append((session, run))
-        runs.sort(key=lambda payload: payload[1].completed_at or payload[1].started_at, reverse=True)
-        return runs[:limit]
+        if limit <= 0:
+            return []
+        index = self._runs_by_agent.get(agent_id, []) if agent_id else self._runs_by_time
+        return [(session, run) for _, _, session, run in reversed(index[-limit:])]
 
+    @_after_load
     def get_cross_session_summary(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
-        sessions = self.list_sessions(agent_id=agent_id)
-        total_runs = sum(len(session.runs) for session in sessions)
-        success_runs = sum(session.success_runs() for session in sessions)
-        durations: List[float] = []
-        last_run: Optional[datetime] = None
-
-        for session in sessions:
-            for run in session.runs:
-                duration = run.duration_ms()
-                if duration is None and run.metrics:
-                    metric_duration = run.metrics.get("duration_ms")
-                    if metric_duration is not None:
-                        duration = float(metric_duration)
-                if duration is not None:
-                    durations.append(float(duration))
-                finished_at = run.completed_at or run.started_at
-                if finished_at and (not last_run or finished_at > last_run):
-                    last_run = finished_at
+        if agent_id:
+            sessions = self._agent_sessions(agent_id)
+            totals = self._totals_by_agent.get(agent_id) or _RunTotals()
+            index = self._runs_by_agent.get(agent_id, [])
+        else:
+            sessions = list(self._sessions.values())
+            totals = self._totals
+            index = self._runs_by_time
+        last_run = index[-1][0] if index else None
+        durations = totals.durations
 
         return {
             "total_sessions": len(sessions),
             "active_sessions": len([s for s in sessions if s.status == "active"]),
-            "total_runs": total_runs,
-            "success_rate": (success_runs / total_runs * 100.0) if total_runs else 0.0,
-            "avg_duration_ms": (sum(durations) / len(durations)) if durations else 0.0,
+            "total_runs": totals.runs,
+            "success_rate": (totals.success_runs / totals.runs * 100.0) if totals.runs else 0.0,
+            "avg_duration_ms": float(durations.mean()) if durations.size else 0.0,
+            "max_duration_ms": float(durations.max()) if durations.size else 0.0,
+            "p95_duration_ms": float(np.percentile(durations, 95)) if durations.size else 0.0,
             "last_run_at": last_run.isoformat() if last_run else None,
         }
 
+    @_after_load
     def cleanup(self):
         cutoff = _utcnow() - timedelta(days=self.retention_days)
         with self._lock:
@@ -187,7 +398,133 @@ class SessionManager:
             for session_id in to_remove:
                 del self._sessions[session_id]
             if to_remove:
-                self._persist_locked()
+                self._rebuild_run_index_locked()
+                self._write_queue.put(_COMPACT)
+
+    @_after_load
+    def compact(self):
+        """Rewrite the session log as snapshots and wait for it to finish."""
+        self._write_queue.put(_COMPACT)
+        self.flush()
+
+    def flush(self):
+        """Block until every queued change has been written to the session log."""
+        if self._writer_thread.is_alive():
+            self._write_queue.join()
+
+    def close(self):
+        """Flush pending writes, stop the writer thread and release the log handle.
+
+        Like ``flush``, this works even if the log failed to load: the writer has
+        already exited then, so there is nothing to do.
+        """
+        if not self._writer_thread.is_alive():
+            return
+        self._write_queue.put(_STOP)
+        self._writer_thread.join()
+
+    # ------------------------------------------------------------------
+    # Run index helpers
+    # ------------------------------------------------------------------
+    def _build_run(
+        self,
+        session: SessionRecord,
+        *,
+        agent_id: Optional[str] = None,
+        status: str = "completed",
+        started_at: Optional[datetime] = None,
+        completed_at: Optional[datetime] = None,
+        **fields: Any,
+    ) -> SessionRun:
+        run = SessionRun.build(
+            run_id=fast_id(),
+            session_id=session.session_id,
+            agent_id=agent_id or session.agent_id,
+            status=status,
+            started_at=started_at or _utcnow(),
+            completed_at=completed_at or _utcnow(),
+            **fields,
+        )
+        if run.completed_at is None:
+            run.completed_at = _utcnow()
+        return run
+
+    def _apply_run_locked(self, session: SessionRecord, run: SessionRun, encoded: bytes) -> SessionRun:
+        session.add_run(run)
+        self._index_run_locked(session, run)
+        self._write_queue.put(
+            _dump_line(
+                {
+                    "op": "add_run",
+                    "session_id": session.session_id,
+                    "run": orjson.Fragment(encoded),
+                    "updated_at": session.updated_at.isoformat(),
+                }
+            )
+        )
+        self._enforce_run_cap_locked(session)
+        return run
+
+    def _index_run_locked(self, session: SessionRecord, run: SessionRun):
+        # New runs normally finish "now", so insort lands at the tail of each list.
+        entry = (run.completed_at or run.started_at, next(self._run_seq), session, run)
+        insort(self._runs_by_time, entry)
+        insort(self._runs_by_agent[session.agent_id], entry)
+        self._totals.add(run)
+        self._totals_by_agent[session.agent_id].add(run)
+
+    def _agent_sessions(self, agent_id: str) -> List[SessionRecord]:
+        sessions = self._sessions
+        return [sessions[sid] for sid in self._sessions_by_agent.get(agent_id, ()) if sid in sessions]
+
+    def _rebuild_run_index_locked(self):
+        self._sessions_by_agent = defaultdict(list)
+        for session in self._sessions.values():
+            self._sessions_by_agent[session.agent_id].append(session.session_id)
+
+        entries = [
+            (run.completed_at or run.started_at, next(self._run_seq), session, run)
+            for session in self._sessions.values()
+            for run in session.runs
+        ]
+        entries.sort()
+        self._runs_by_time = entries
+        self._runs_by_agent = defaultdict(list)
+        self._totals = _RunTotals()
+        self._totals_by_agent = defaultdict(_RunTotals)
+        for entry in entries:
+            session, run = entry[2], entry[3]
+            self._runs_by_agent[session.agent_id].append(entry)
+            self._totals.add(run)
+            self._totals_by_agent[session.agent_id].add(run)
+        for session in self._sessions.values():
+            if session.archived_runs:
+                self._totals.add_archived(session)
+                self._totals_by_agent[session.agent_id].add_archived(session)
+
+    def _unindex_run_locked(self, session: SessionRecord, run: SessionRun):
+        # Archived runs keep counting towards the run totals; only their durations go.
+        self._totals.discard_duration(run)
+        self._totals_by_agent[session.agent_id].discard_duration(run)
+        key = run.completed_at or run.started_at
+        for index in (self._runs_by_time, self._runs_by_agent[session.agent_id]):
+            pos = bisect_left(index, (key,))
+            while pos < len(index) and index[pos][0] == key:
+                if index[pos][3] is run:
+                    del index[pos]
+                    break
+                pos += 1
+
+    def _enforce_run_cap_locked(self, session: SessionRecord):
+        excess = len(session.runs) - self.max_runs_per_session
+        if excess <= 0:
+            return
+        evicted = session.archive_oldest_runs(excess)
+        for run in evicted:
+            self._unindex_run_locked(session, run)
+        line = _dump_line({"op": "archive_runs", "session_id": session.session_id, "count": len(evicted)})
+        runs = b"".join(orjson.dumps(run.to_dict(), option=_LOG_OPTIONS) for run in evicted)
+        self._write_queue.put(_ArchiveWrite(session.session_id, runs, line))
 
     # ------------------------------------------------------------------
     # Persistence helpers
@@ -195,30 +532,164 @@ class SessionManager:
     def _load_sessions(self):
         if not self.storage_file.exists():
             return
-        with self.storage_file.open("r") as handle:
-            for line in handle:
+        with self.storage_file.open("rb") as handle:
+            for line_number, line in enumerate(handle, 1):
                 if not line.strip():
                     continue
                 try:
-                    payload = json.loads(line)
-                    session = SessionRecord.from_dict(payload)
-                    self._sessions[session.session_id] = session
-                except json.JSONDecodeError:
-                    continue
+                    self._apply_event(orjson.loads(line))
+                except Exception as exc:
+                    # One bad line (torn write, hand edit, old schema) must not make the
+                    # whole log unreadable.
+                    self.logger.warning(
+                        "Skipping unreadable line %d of %s: %r", line_number, self.storage_file, exc
+                    )
+        self._compacted_size = self.storage_file.stat().st_size
+
+    def _apply_event(self, payload: Dict[str, Any]):
+        """Fold a single log line into the in-memory state."""
+        op = payload.get("op")
+        if op is None:
+            # Compacted snapshot line (also the format written by older versions).
+            session = SessionRecord.from_dict(payload)
+            self._sessions[session.session_id] = session
+        elif op == "start_session":
+            session = SessionRecord.from_dict(payload["session"])
+            self._sessions[session.session_id] = session
+        elif op == "add_run":
+            session = self._sessions.get(payload["session_id"])
+            if session:
+                session.runs.append(SessionRun.from_dict(payload["run"]))
+                session.updated_at = _parse_datetime(payload.get("updated_at")) or session.updated_at
+        elif op == "close_session":
+            session = self._sessions.get(payload["session_id"])
+            if session:
+                session.status = payload.get("status", session.status)
+                session.updated_at = _parse_datetime(payload.get("updated_at")) or session.updated_at
+        elif op == "archive_runs":
+            session = self._sessions.get(payload["session_id"])
+            if session:
+                session.archive_oldest_runs(payload["count"])
+
+    def _writer_loop(self):
+        """Load the log, then drain the write queue in batches; the only place the log file is touched."""
+        try:
+            with self._lock:
+                self._load_sessions()
+                self._rebuild_run_index_locked()
+                for session in self._sessions.values():
+                    self._enforce_run_cap_locked(session)
+        except Exception as exc:
+            # Never write (or compact) over a log that could not be read back.
+            self.logger.exception("Failed to load session log %s", self.storage_file)
+            self._load_error = exc
+            return
+        finally:
+            self._loaded.set()
+
+        stopping = False
+        while not stopping:
+            batch = [self._write_queue.get()]
+            while len(batch) < self.write_batch_size:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = _STOP in batch
+            try:
+                if self._write_batch(batch):
+                    stopping = True
+            except Exception:
+                self.logger.exception("Failed to persist %d session log entries", len(batch))
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
 
-    def _persist_locked(self):
+        if self._log_handle is not None:
+            self._log_handle.close()
+            self._log_handle = None
+
+    def _write_batch(self, batch: List[Any]) -> bool:
+        """Persist one batch; returns True if compaction drained a stop request."""
+        lines = []
+        for item in batch:
+            if item is _STOP or item is _COMPACT:
+                continue
+            if isinstance(item, _ArchiveWrite):
+                # The archive must hold the runs before the log records their eviction.
+                self._write_archive(item.session_id, item.runs)
+                item = item.line
+            lines.append(item)
+
+        if _COMPACT in batch:
+            # The snapshot already reflects every queued delta, so skip appending them.
+            return self._compact()
+        if not lines:
+            return False
+        if self._log_handle is None:
+            self._log_handle = self.storage_file.open("ab")
+        self._log_handle.write(b"".join(lines))
+        self._log_handle.flush()
+
+        threshold = max(self._compacted_size * self.compact_factor, self.min_compact_bytes)
+        if self._log_handle.tell() > threshold:
+            return self._compact()
+        return False
+
+    def _compact(self) -> bool:
+        """Rewrite the log as one snapshot line per session (writer thread only)."""
+        stop_requested = False
+        archived: List[_ArchiveWrite] = []
+        with self._lock:
+            # Producers enqueue while holding the lock, so anything still queued is
+            # already part of the in-memory state being snapshotted here. Evicted runs
+            # are the exception: they only exist in the queued archive events.
+            while True:
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                stop_requested = stop_requested or item is _STOP
+                if isinstance(item, _ArchiveWrite):
+                    archived.append(item)
+                self._write_queue.task_done()
+            snapshot = [session.to_dict() for session in self._sessions.values()]
+
+        for item in archived:
+            self._write_archive(item.session_id, item.runs)
+
+        if self._log_handle is not None:
+            self._log_handle.close()
+            self._log_handle = None
         tmp_file = self.storage_file.with_suffix(".tmp")
-        with tmp_file.open("w") as handle:
-            for session in self._sessions.values():
-                handle.write(json.dumps(session.to_dict()))
-                handle.write("\n")
+        with tmp_file.open("wb") as handle:
+            handle.write(b"".join(orjson.dumps(payload, option=_LOG_OPTIONS) for payload in snapshot))
+            handle.flush()
+            # Compaction replaces the whole log, so make it durable before the rename.
+            os.fsync(handle.fileno())
         tmp_file.replace(self.storage_file)
+        self._compacted_size = self.storage_file.stat().st_size
+
+        if self.archive_dir.exists():
+            live = {payload["session_id"] for payload in snapshot}
+            for archive_file in self.archive_dir.glob("*.jsonl"):
+                if archive_file.stem not in live:
+                    archive_file.unlink()
+        return stop_requested
+
+    def _write_archive(self, session_id: str, runs: bytes):
+        self.archive_dir.mkdir(exist_ok=True)
+        with (self.archive_dir / f"{session_id}.jsonl").open("ab") as handle:
+            handle.write(runs)
 
     # ------------------------------------------------------------------
     # Utilities
     # ------------------------------------------------------------------
+    @_after_load
     def __len__(self) -> int:
         return len(self._sessions)
 
+    @_after_load
     def __iter__(self) -> Iterable[SessionRecord]:
         return iter(self._sessions.values())
@@ -34,6 +34,7 @@ setup(
         "pydantic>=2.0.0",
         "pydantic-settings>=2.0.0",
         "requests>=2.31.0",
+        "orjson>=3.9.0",
         "plotly>=5.17.0",
     ],
     extras_require={
@@ -1,19 +1,25 @@
+from __future__ import annotations
+
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Any, List
-from datetime import datetime
-import uuid
+from typing import Any, Optional
+from datetime import datetime, timezone
+from threading import Lock
+import sys
 import time
 from .events import Event, EventType
+from utils.config import Config
+from utils.helpers import DATACLASS_SLOTS, fast_id
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SpanAttribute:
     key: str
     value: Any
     timestamp: datetime = field(default_factory=datetime.utcnow)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Span:
     span_id: str
     trace_id: str
@@ -21,33 +27,42 @@ class Span:
     operation_name: str
     start_time: datetime = field(default_factory=datetime.utcnow)
     end_time: Optional[datetime] = None
-    attributes: Dict[str, Any] = field(default_factory=dict)
-    events: List[Dict[str, Any]] = field(default_factory=list)
+    # Monotonic clock readings used for durations; the datetimes are only for display.
+    start_ns: int = field(default_factory=time.monotonic_ns)
+    end_ns: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    events: list[dict[str, Any]] = field(default_factory=list)
     status: str = "PENDING"
     error: Optional[str] = None
 
+    def __post_init__(self):
+        # Operation names and agent ids repeat across thousands of spans; share one copy.
+        # Only exact str can be interned; anything else is kept as given.
+        if type(self.operation_name) is str:
+            self.operation_name = sys.intern(self.operation_name)
+        agent_id = self.attributes.get("agent_id")
+        if type(agent_id) is str:
+            self.attributes["agent_id"] = sys.intern(agent_id)
+
     def add_attribute(self, key: str, value: Any):
         self.attributes[key] = value
 
-    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None):
-        event = {
-            "name": name,
-            "timestamp": datetime.utcnow().isoformat(),
-            "attributes": attributes or {},
-        }
-        self.events.append(event)
+    def add_event(self, name: str, attributes: Optional[dict[str, Any]] = None):
+        # Keep the raw wall-clock reading; it is only formatted if the span is serialized.
+        self.events.append({"name": name, "ts_ns": time.time_ns(), "attributes": attributes or {}})
 
     def end(self, status: str = "OK", error: Optional[str] = None):
+        self.end_ns = time.monotonic_ns()
         self.end_time = datetime.utcnow()
         self.status = status
         self.error = error
 
     def duration_ms(self) -> float:
-        if not self.end_time:
+        if self.end_ns is None:
             return -1
-        return (self.end_time - self.start_time).total_seconds() * 1000
+        return (self.end_ns - self.start_ns) / 1e6
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self) -> dict[str, Any]:
         return {
             "span_id": self.span_id,
             "trace_id": self.trace_id,
@@ -57,28 +72,41 @@ class Span:
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "duration_ms": self.duration_ms(),
             "attributes": self.attributes,
-            "events": self.events,
+            "events": [
+                {"name": event["name"], "timestamp": _format_ns(event["ts_ns"]), "attributes": event["attributes"]}
+                for event in self.events
+            ],
             "status": self.status,
             "error": self.error,
         }
 
 
+def _format_ns(ts_ns: int) -> str:
+    return datetime.fromtimestamp(ts_ns / 1e9, timezone.utc).replace(tzinfo=None).isoformat()
+
+
 class AgentTracer:
-    def __init__(self, metrics_registry=None, event_emitter=None):
+    def __init__(self, metrics_registry=None, event_emitter=None, max_completed_spans: Optional[int] = None):
         self.metrics_registry = metrics_registry
         self.event_emitter = event_emitter
-        self.active_spans: Dict[str, Span] = {}
-        self.completed_spans: List[Span] = []
-        self.trace_stack: List[str] = []
+        # Spans are independent, so only the shared trace stack needs a lock; dict pops
+        # and deque appends are atomic on their own.
+        self.active_spans: dict[str, Span] = {}
+        self.completed_spans: deque[Span] = deque(maxlen=max_completed_spans or Config.MAX_COMPLETED_SPANS)
+        self.trace_stack: list[str] = []
+        self._stack_lock = Lock()
+        # Per-operation aggregates over completed_spans, kept in step with the deque.
+        self._op_stats: dict[str, dict[str, float]] = defaultdict(_new_op_stats)
+        self._stats_lock = Lock()
 
     def start_trace(
-        self, agent_id: str, trace_id: Optional[str] = None, context: Optional[Dict[str, Any]] = None
+        self, agent_id: str, trace_id: Optional[str] = None, context: Optional[dict[str, Any]] = None
     ) -> str:
         if not trace_id:
-            trace_id = str(uuid.uuid4())
+            trace_id = fast_id()
 
         span = Span(
-            span_id=str(uuid.uuid4()),
+            span_id=fast_id(),
             trace_id=trace_id,
             parent_span_id=None,
             operation_name=f"agent:{agent_id}",
@@ -86,7 +114,8 @@ class AgentTracer:
         )
 
         self.active_spans[span.span_id] = span
-        self.trace_stack.append(span.span_id)
+        with self._stack_lock:
+            self.trace_stack.append(span.span_id)
 
         if self.event_emitter:
             self.event_emitter.emit_agent_event(agent_id, "AGENT_START", "Agent execution started", {"trace_id": trace_id})
@@ -94,37 +123,46 @@ class AgentTracer:
         return trace_id
 
     def start_span(
-        self, operation_name: str, trace_id: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None
+        self, operation_name: str, trace_id: Optional[str] = None, attributes: Optional[dict[str, Any]] = None
     ) -> str:
-        span_id = str(uuid.uuid4())
-        parent_span_id = self.trace_stack[-1] if self.trace_stack else None
+        span_id = fast_id()
+        with self._stack_lock:
+            parent_span_id = self.trace_stack[-1] if self.trace_stack else None
 
         if not trace_id and parent_span_id:
-            trace_id = self.active_spans[parent_span_id].trace_id
+            parent = self.active_spans.get(parent_span_id)
+            trace_id = parent.trace_id if parent else None
 
         span = Span(
             span_id=span_id,
-            trace_id=trace_id or str(uuid.uuid4()),
+            trace_id=trace_id or fast_id(),
             parent_span_id=parent_span_id,
             operation_name=operation_name,
             attributes=attributes or {},
         )
 
         self.active_spans[span_id] = span
-        self.trace_stack.append(span_id)
+        with self._stack_lock:
+            self.trace_stack.append(span_id)
 
         return span_id
 
     def end_span(self, span_id: str, status: str = "OK", error: Optional[str] = None):
-        if span_id not in self.active_spans:
+        span = self.active_spans.pop(span_id, None)
+        if span is None:
             return
 
-        span = self.active_spans.pop(span_id)
         span.end(status, error)
-        self.completed_spans.append(span)
+        with self._stats_lock:
+            completed = self.completed_spans
+            if completed.maxlen is not None and len(completed) == completed.maxlen:
+                self._account_span(completed[0], -1)
+            completed.append(span)
+            self._account_span(span, 1)
 
-        if self.trace_stack and self.trace_stack[-1] == span_id:
-            self.trace_stack.pop()
+        with self._stack_lock:
+            if self.trace_stack and self.trace_stack[-1] == span_id:
+                self.trace_stack.pop()
 
         if self.metrics_registry and "span_duration" in self.metrics_registry.metrics:
             self.metrics_registry.get_metric("span_duration").record(span.duration_ms())
@@ -137,11 +175,11 @@ class AgentTracer:
             ))
 
     def trace_agent_call(
-        self, agent_id: str, input_data: Any, context: Optional[Dict[str, Any]] = None
+        self, agent_id: str, input_data: Any, context: Optional[dict[str, Any]] = None
     ) -> str:
         return self.start_trace(agent_id, context={"input": str(input_data)[:500], **(context or {})})
 
-    def trace_tool_call(self, tool_name: str, tool_input: Any, attributes: Optional[Dict[str, Any]] = None) -> str:
+    def trace_tool_call(self, tool_name: str, tool_input: Any, attributes: Optional[dict[str, Any]] = None) -> str:
         attrs = {
             "tool_name": tool_name,
             "input": str(tool_input)[:500],
@@ -150,7 +188,7 @@ class AgentTracer:
         return self.start_span(f"tool:{tool_name}", attributes=attrs)
 
     def trace_llm_call(
-        self, model: str, prompt_tokens: int, attributes: Optional[Dict[str, Any]] = None
+        self, model: str, prompt_tokens: int, attributes: Optional[dict[str, Any]] = None
     ) -> str:
         attrs = {
             "model": model,
@@ -163,7 +201,7 @@ class AgentTracer:
         if span_id in self.active_spans:
             self.active_spans[span_id].add_attribute(key, value)
 
-    def add_span_event(self, span_id: str, event_name: str, attributes: Optional[Dict[str, Any]] = None):
+    def add_span_event(self, span_id: str, event_name: str, attributes: Optional[dict[str, Any]] = None):
         if span_id in self.active_spans:
             self.active_spans[span_id].add_event(event_name, attributes)
 
@@ -173,41 +211,47 @@ class AgentTracer:
             if not trace_id or span.trace_id == trace_id:
                 self.end_span(span.span_id, status)
 
-    def get_trace(self, trace_id: str) -> List[Dict[str, Any]]:
-        return [span.to_dict() for span in self.completed_spans if span.trace_id == trace_id]
+    def get_trace(self, trace_id: str) -> list[dict[str, Any]]:
+        return [span.to_dict() for span in list(self.completed_spans) if span.trace_id == trace_id]
 
-    def get_spans_by_operation(self, operation_name: str) -> List[Span]:
-        return [span for span in self.completed_spans if span.operation_name == operation_name]
+    def get_spans_by_operation(self, operation_name: str) -> list[Span]:
+        return [span for span in list(self.completed_spans) if span.operation_name == operation_name]
 
-    def get_all_spans(self) -> List[Span]:
-        return self.completed_spans
+    def get_all_spans(self) -> list[Span]:
+        return list(self.completed_spans)
 
     def clear_spans(self):
         self.active_spans.clear()
-        self.completed_spans.clear()
-        self.trace_stack.clear()
+        with self._stats_lock:
+            self.completed_spans.clear()
+            self._op_stats.clear()
+        with self._stack_lock:
+            self.trace_stack.clear()
+
+    def get_statistics(self) -> dict[str, Any]:
+        with self._stats_lock:
+            by_operation = {
+                op: {**st, "avg_duration_ms": st["total_duration_ms"] / st["count"]}
+                for op, st in self._op_stats.items()
+            }
+            total_spans = len(self.completed_spans)
 
-    def get_statistics(self) -> Dict[str, Any]:
-        stats = {
-            "total_spans": len(self.completed_spans),
+        return {
+            "total_spans": total_spans,
             "active_spans": len(self.active_spans),
-            "by_operation": {},
+            "by_operation": by_operation,
         }
 
-        for span in self.completed_spans:
-            op = span.operation_name
-            if op not in stats["by_operation"]:
-                stats["by_operation"][op] = {"count": 0, "total_duration_ms": 0, "errors": 0}
-            stats["by_operation"][op]["count"] += 1
-            stats["by_operation"][op]["total_duration_ms"] += span.duration_ms()
-            if span.status != "OK":
-                stats["by_operation"][op]["errors"] += 1
-
-        for op_stats in stats["by_operation"].values():
-            if op_stats["count"] > 0:
-                op_stats["avg_duration_ms"] = op_stats["total_duration_ms"] / op_stats["count"]
-
-        return stats
+    def _account_span(self, span: Span, sign: int):
+        op = span.operation_name
+        st = self._op_stats[op]
+        st["count"] += sign
+        st["total_duration_ms"] += sign * span.duration_ms()
+        if span.status != "OK":
+            st["errors"] += sign
+        if st["count"] <= 0:
+            del self._op_stats[op]
 
 
-from .events import Event
+def _new_op_stats() -> dict[str, float]:
+    return {"count": 0, "total_duration_ms": 0.0, "errors": 0}
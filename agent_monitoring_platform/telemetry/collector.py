@@ -1,8 +1,11 @@
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from threading import Thread, Lock
+import logging
 import time
 
+from utils.config import Config
+
 from .metrics import MetricsRegistry, Metric
 from .events import EventEmitter, Event
 from .agent_tracer import AgentTracer
@@ -10,8 +13,17 @@ from .performance_monitor import PerformanceMonitor
 from .exporters import MetricsExporter, JSONExporter
 
 
+# Consecutive failed deliveries of the same event batch before it is skipped, so one
+# event no exporter can encode does not block every later event forever.
+MAX_EVENT_EXPORT_ATTEMPTS = 3
+
 class TelemetryCollector:
-    def __init__(self, metrics_registry: Optional[MetricsRegistry] = None, export_interval: int = 60):
+    def __init__(
+        self,
+        metrics_registry: Optional[MetricsRegistry] = None,
+        export_interval: int = 60,
+        summary_ttl_s: float = 1.0,
+    ):
         self.metrics_registry = metrics_registry or MetricsRegistry()
         self.event_emitter = EventEmitter()
         self.agent_tracer = AgentTracer(self.metrics_registry, self.event_emitter)
@@ -20,8 +32,20 @@ class TelemetryCollector:
         self.export_interval = export_interval
         self.is_running = False
         self.export_thread: Optional[Thread] = None
+        self.logger = logging.getLogger(__name__)
         self.lock = Lock()
+        # Serializes exporter I/O without holding self.lock, so registration never waits on an export.
+        self._export_lock = Lock()
+        # Sequence number of the last event each exporter accepted, keyed by id(exporter).
+        self._exporter_cursors: Dict[int, int] = {}
+        # Consecutive failed event deliveries per exporter, keyed by id(exporter).
+        self._exporter_failures: Dict[int, int] = {}
         self._retention_days = 90
+        # Raw values back percentiles over a short window; older data lives in metric rollups.
+        self._raw_retention = timedelta(minutes=Config.RAW_METRIC_RETENTION_MINUTES)
+        # Summary parts and health are reused for summary_ttl_s seconds (0 disables caching).
+        self.summary_ttl_s = summary_ttl_s
+        self._read_cache: Dict[str, Tuple[float, Optional[int], Dict[str, Any]]] = {}
 
     def add_exporter(self, exporter: MetricsExporter):
         with self.lock:
@@ -40,40 +64,90 @@ class TelemetryCollector:
         self.performance_monitor.stop()
         if self.export_thread:
             self.export_thread.join(timeout=5.0)
+        self._read_cache.clear()
+        with self.lock:
+            exporters = tuple(self.exporters)
+        with self._export_lock:
+            for exporter in exporters:
+                exporter.close()
 
     def _export_loop(self):
         while self.is_running:
             try:
                 self.export_all()
                 self.cleanup_old_data()
-            except Exception as e:
-                print(f"Error in export loop: {e}")
+            except Exception:
+                self.logger.exception("Error in export loop")
             time.sleep(self.export_interval)
 
     def export_all(self) -> bool:
         with self.lock:
-            if not self.exporters:
-                return False
+            exporters = tuple(self.exporters)
+        if not exporters:
+            return False
 
+        metrics_snapshot = dict(self.metrics_registry.metrics)
+        with self._export_lock:
             results = []
-            for exporter in self.exporters:
+            for exporter in exporters:
                 try:
-                    result = exporter.export(self.metrics_registry.metrics)
-                    exporter.export_events(self.event_emitter.get_events())
+                    result = exporter.export(metrics_snapshot)
+                    # Only events this exporter has not accepted yet; the cursor moves on success.
+                    events = self.event_emitter.get_events_since_seq(self._exporter_cursors.get(id(exporter), -1))
+                    if events and not self._deliver_events(exporter, events):
+                        result = False
                     results.append(result)
-                except Exception as e:
-                    print(f"Error exporting metrics: {e}")
+                except Exception:
+                    self.logger.exception("Exporter %s failed", type(exporter).__name__)
                     results.append(False)
 
-            return all(results) if results else False
+            return all(results)
+
+    def _deliver_events(self, exporter: MetricsExporter, events: List[Event]) -> bool:
+        """Offer ``events`` to ``exporter``, moving its cursor past them on success.
+
+        A failed batch is offered again on the next export, up to
+        ``MAX_EVENT_EXPORT_ATTEMPTS`` times in a row; after that it is logged and skipped.
+        """
+        key = id(exporter)
+        try:
+            delivered = exporter.export_events(events)
+        except Exception:
+            self.logger.exception("Exporter %s failed to export events", type(exporter).__name__)
+            delivered = False
+        if delivered is None:
+            # The contract is a bool; None is a failed delivery, so these events are offered again.
+            self.logger.warning("%s.export_events returned None; treating it as failed", type(exporter).__name__)
+        if delivered:
+            self._exporter_failures.pop(key, None)
+            self._exporter_cursors[key] = events[-1].seq
+            return True
+
+        failures = self._exporter_failures.get(key, 0) + 1
+        if failures >= MAX_EVENT_EXPORT_ATTEMPTS:
+            self.logger.error(
+                "%s failed to export events %d-%d %d times in a row; dropping them",
+                type(exporter).__name__,
+                events[0].seq,
+                events[-1].seq,
+                failures,
+            )
+            self._exporter_failures.pop(key, None)
+            self._exporter_cursors[key] = events[-1].seq
+        else:
+            self._exporter_failures[key] = failures
+        return False
 
     def export_to_file(self, output_dir: str = ".") -> bool:
         exporter = JSONExporter(output_dir)
-        return exporter.export(self.metrics_registry.metrics)
+        try:
+            return exporter.export(self.metrics_registry.metrics)
+        finally:
+            exporter.close()
 
     def cleanup_old_data(self):
         retention = timedelta(days=self._retention_days)
-        self.metrics_registry.cleanup_old_values(retention)
+        self.metrics_registry.cleanup_old_values(retention, min(self._raw_retention, retention))
         self.agent_tracer.clear_spans()
 
     def set_retention_days(self, days: int):
@@ -85,15 +159,35 @@ class TelemetryCollector:
     def get_metric(self, name: str) -> Optional[Metric]:
         return self.metrics_registry.get_metric(name)
 
+    def _cached(self, key: str, compute: Callable[[], Dict[str, Any]], version: Optional[int] = None) -> Dict[str, Any]:
+        """Return a recent result for ``key``; cached results are shared and must not be mutated.
+
+        With ``version`` the result is reused for as long as the version is unchanged,
+        otherwise for ``summary_ttl_s`` seconds.
+        """
+        now = time.monotonic()
+        cached = self._read_cache.get(key)
+        if cached is not None:
+            cached_at, cached_version, result = cached
+            if version is not None and self.summary_ttl_s > 0:
+                if cached_version == version:
+                    return result
+            elif now - cached_at < self.summary_ttl_s:
+                return result
+        result = compute()
+        self._read_cache[key] = (now, version, result)
+        return result
+
     def get_all_metrics_summary(self) -> Dict[str, Any]:
-        summary = {
+        # Each part is cached on its own, so a fresh timestamp costs nothing and the
+        # slow system sample is not redone just because an event was emitted.
+        return {
             "timestamp": datetime.utcnow().isoformat(),
             "metrics": self.metrics_registry.get_all_metrics(),
-            "events": self.event_emitter.get_stats(),
+            "events": self._cached("events", self.event_emitter.get_stats, version=self.event_emitter.version),
             "traces": self.agent_tracer.get_statistics(),
-            "system": self.performance_monitor.get_metrics_summary(),
+            "system": self._cached("system", self.performance_monitor.get_metrics_summary),
         }
-        return summary
 
     def record_agent_execution(
         self,
@@ -105,8 +199,8 @@ class TelemetryCollector:
         metadata: Optional[Dict[str, Any]] = None,
     ):
         trace_id = self.agent_tracer.start_trace(agent_id, context=metadata)
-        dur_metric = self.metrics_registry.get_metric("agent_execution_duration") or self._create_default_histogram("agent_execution_duration")
-        success_metric = self.metrics_registry.get_metric("agent_success_rate") or self._create_default_counter("agent_success_rate")
+        dur_metric = self._create_default_histogram("agent_execution_duration")
+        success_metric = self._create_default_counter("agent_success_rate")
 
         if dur_metric:
             dur_metric.record(duration_ms)
@@ -124,8 +218,9 @@ class TelemetryCollector:
         latency_ms: float,
         cost: float = 0.0,
         error: Optional[str] = None,
+        cache_hit: bool = False,
     ):
-        span_id = self.agent_tracer.trace_llm_call(model, prompt_tokens)
+        span_id = self.agent_tracer.trace_llm_call(model, prompt_tokens, attributes={"cache_hit": cache_hit})
 
         if error:
             self.agent_tracer.end_span(span_id, status="ERROR", error=error)
@@ -135,9 +230,7 @@ class TelemetryCollector:
             self.agent_tracer.add_span_attribute(span_id, "cost", cost)
             self.agent_tracer.end_span(span_id, status="OK")
 
-        llm_latency_metric = self.metrics_registry.get_metric("llm_latency_ms") or self._create_default_histogram(
-            "llm_latency_ms"
-        )
+        llm_latency_metric = self._create_default_histogram("llm_latency_ms")
         if llm_latency_metric:
             llm_latency_metric.record(latency_ms, tags={"model": model})
 
@@ -151,9 +244,7 @@ class TelemetryCollector:
         else:
             self.agent_tracer.end_span(span_id, status="OK")
 
-        tool_duration_metric = self.metrics_registry.get_metric("tool_execution_duration") or self._create_default_histogram(
-            "tool_execution_duration"
-        )
+        tool_duration_metric = self._create_default_histogram("tool_execution_duration")
         if tool_duration_metric:
             tool_duration_metric.record(duration_ms, tags={"tool": tool_name})
 
@@ -167,6 +258,10 @@ class TelemetryCollector:
         return self.event_emitter.get_events_since(timestamp)
 
     def _create_default_histogram(self, name: str):
+        # Double-checked: a lock-free dict read serves every call once the metric exists.
+        existing = self.metrics_registry.metrics.get(name)
+        if existing:
+            return existing
         with self.lock:
             existing = self.metrics_registry.get_metric(name)
             if existing:
@@ -174,19 +269,26 @@ class TelemetryCollector:
             return self.metrics_registry.histogram(name, f"Default histogram: {name}", unit="ms")
 
     def _create_default_counter(self, name: str):
+        existing = self.metrics_registry.metrics.get(name)
+        if existing:
+            return existing
         with self.lock:
             existing = self.metrics_registry.get_metric(name)
             if existing:
                 return existing
-            return self.metrics_registry.counter(name, f"Default counter: {name}")
+            # Default counters are only read as totals, so they skip per-increment history.
+            return self.metrics_registry.counter(name, f"Default counter: {name}", record_history=False)
 
     def emit_event(self, event: Event):
         self.event_emitter.emit(event)
 
     def get_health_status(self) -> Dict[str, Any]:
+        # is_running flips on start()/stop(), so it is read live rather than cached.
+        return {"is_running": self.is_running, **self._cached("health", self._build_health_status)}
+
+    def _build_health_status(self) -> Dict[str, Any]:
         system_metrics = self.performance_monitor.get_current_metrics()
         return {
-            "is_running": self.is_running,
             "cpu_percent": system_metrics.cpu_percent,
             "memory_percent": system_metrics.memory_percent,
             "disk_percent": system_metrics.disk_percent,
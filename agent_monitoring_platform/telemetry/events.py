@@ -1,8 +1,14 @@
+import itertools
+from bisect import bisect_left
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Callable, Optional, Any
+from typing import Deque, Dict, List, Callable, Optional, Any, Tuple
 from enum import Enum
 from datetime import datetime
-import uuid
+from threading import Lock
+
+from utils.config import Config
+from utils.helpers import DATACLASS_SLOTS, fast_id
 
 
 class EventType(str, Enum):
@@ -28,24 +34,44 @@ class EventSeverity(str, Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+def _enum_value(value: Any) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class Event:
     event_type: Any
     timestamp: datetime = field(default_factory=datetime.utcnow)
     severity: EventSeverity = EventSeverity.INFO
     source: str = ""
     message: str = ""
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    event_id: str = field(default_factory=fast_id)
     data: Dict[str, Any] = field(default_factory=dict)
     context: Dict[str, Any] = field(default_factory=dict)
+    # String forms of event_type/severity, resolved once; events are not mutated after emit.
+    _type_value: str = field(init=False, repr=False, compare=False)
+    _severity_value: str = field(init=False, repr=False, compare=False)
+    # Position in the emitter's history, assigned by EventEmitter.emit (-1 until emitted).
+    seq: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._type_value = _enum_value(self.event_type)
+        self._severity_value = _enum_value(self.severity)
+
+    @property
+    def type_value(self) -> str:
+        return self._type_value
+
+    @property
+    def severity_value(self) -> str:
+        return self._severity_value
 
     def to_dict(self) -> Dict[str, Any]:
-        et_value = self.event_type.value if hasattr(self.event_type, "value") else str(self.event_type)
         return {
             "event_id": self.event_id,
-            "event_type": et_value,
+            "event_type": self._type_value,
             "timestamp": self.timestamp.isoformat(),
-            "severity": self.severity.value,
+            "severity": self._severity_value,
             "source": self.source,
             "message": self.message,
             "data": self.data,
@@ -67,25 +93,28 @@ class LoggingEventHandler(EventHandler):
         self.logger = logger
 
     def handle(self, event: Event):
-        et_value = event.event_type.value if hasattr(event.event_type, "value") else str(event.event_type)
-        level = getattr(self.logger, event.severity.value, self.logger.info)
-        level(f"[{et_value}] {event.message}", extra={"event": event.to_dict()})
+        level = getattr(self.logger, event.severity_value, self.logger.info)
+        level(f"[{event.type_value}] {event.message}", extra={"event": event.to_dict()})
 
 
 class StorageEventHandler(EventHandler):
-    def __init__(self, storage_backend, name: str = "storage_handler"):
+    def __init__(self, storage_backend, name: str = "storage_handler", buffer_size: int = 4096):
         super().__init__(name)
         self.storage = storage_backend
-        self.events: List[Event] = []
+        # In-memory mirror of the most recent events; the backend keeps the full record.
+        self.events: Deque[Event] = deque(maxlen=buffer_size)
+        self.dropped = 0
 
     def handle(self, event: Event):
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
         self.events.append(event)
         self.storage.store_event(event)
 
     def get_events(self, event_type: Optional[EventType] = None) -> List[Event]:
         if event_type:
             return [e for e in self.events if e.event_type == event_type]
-        return self.events
+        return list(self.events)
 
 
 class CallbackEventHandler(EventHandler):
@@ -109,27 +138,69 @@ class FilteredEventHandler(EventHandler):
 
 
 class EventEmitter:
-    def __init__(self):
+    def __init__(self, max_events: Optional[int] = None):
         self.handlers: Dict[str, EventHandler] = {}
-        self.event_history: List[Event] = []
+        # Copy-on-write view of the handlers so emit() never iterates a changing dict.
+        self._handlers_snapshot: Tuple[EventHandler, ...] = ()
+        self._handlers_lock = Lock()
+        # Ring buffer of recent events; the oldest are dropped once it is full.
+        self.event_history: Deque[Event] = deque(maxlen=max_events or Config.MAX_EVENT_HISTORY)
+        self.events_dropped = 0
+        # Bumped on every change to the history, so readers can tell when stats are stale.
+        self.version = 0
+        self._seq = itertools.count()
+        self._history_lock = Lock()
+        # Per-type/severity counts over event_history, kept in step with the ring buffer.
+        self._type_counts: Dict[str, int] = defaultdict(int)
+        self._severity_counts: Dict[str, int] = defaultdict(int)
+        # Events of each type in history order; trimmed together with the ring buffer.
+        self._by_type_index: Dict[str, Deque[Event]] = {}
+        # Running max of event timestamps, parallel to event_history from _ts_offset on.
+        # It is sorted even if events arrive slightly out of order, so it can be bisected.
+        self._ts_max: List[datetime] = []
+        self._ts_offset = 0
 
     def subscribe(self, handler: EventHandler):
-        self.handlers[handler.name] = handler
+        with self._handlers_lock:
+            self.handlers[handler.name] = handler
+            self._handlers_snapshot = tuple(self.handlers.values())
 
     def unsubscribe(self, handler_name: str):
-        del self.handlers[handler_name]
+        with self._handlers_lock:
+            del self.handlers[handler_name]
+            self._handlers_snapshot = tuple(self.handlers.values())
 
     def emit(self, event: Event):
-        self.event_history.append(event)
-        for handler in self.handlers.values():
+        # One short critical section: the sequence number must follow history order, and an
+        # evicted event's counts must come off in the same step that pushes it out.
+        with self._history_lock:
+            event.seq = next(self._seq)
+            self.version += 1
+            history = self.event_history
+            if len(history) == history.maxlen:
+                self.events_dropped += 1
+                self._forget(history[0])
+                self._ts_offset += 1
+                if self._ts_offset >= history.maxlen:
+                    del self._ts_max[: self._ts_offset]
+                    self._ts_offset = 0
+            history.append(event)
+            ts_max = self._ts_max
+            ts_max.append(event.timestamp if not ts_max or event.timestamp > ts_max[-1] else ts_max[-1])
+            self._count(event, 1)
+            type_events = self._by_type_index.get(event.type_value)
+            if type_events is None:
+                type_events = self._by_type_index[event.type_value] = deque()
+            type_events.append(event)
+        for handler in self._handlers_snapshot:
             try:
                 handler.handle(event)
             except Exception as e:
                 if isinstance(handler, LoggingEventHandler):
-                    handler.logger.error(f"Error in event handler {handler.name}: {e}")
+                    handler.logger.error("Error in event handler %s: %s", handler.name, e)
 
     def emit_agent_event(self, agent_id: str, event_type: EventType, message: str = "", data: Optional[Dict] = None):
-        et_value = event_type.value if hasattr(event_type, "value") else str(event_type)
+        et_value = _enum_value(event_type)
         event = Event(
             event_type=event_type,
             source=f"agent:{agent_id}",
@@ -140,7 +211,7 @@ class EventEmitter:
         self.emit(event)
 
     def emit_tool_event(self, tool_name: str, event_type: EventType, message: str = "", data: Optional[Dict] = None):
-        et_value = event_type.value if hasattr(event_type, "value") else str(event_type)
+        et_value = _enum_value(event_type)
         event = Event(
             event_type=event_type,
             source=f"tool:{tool_name}",
@@ -151,7 +222,7 @@ class EventEmitter:
         self.emit(event)
 
     def emit_llm_event(self, model: str, event_type: EventType, message: str = "", data: Optional[Dict] = None):
-        et_value = event_type.value if hasattr(event_type, "value") else str(event_type)
+        et_value = _enum_value(event_type)
         event = Event(
             event_type=event_type,
             source=f"llm:{model}",
@@ -161,30 +232,68 @@ class EventEmitter:
         )
         self.emit(event)
 
+    def _history_snapshot(self) -> List[Event]:
+        # Copy under the lock: iterating a deque while emit() appends raises RuntimeError.
+        with self._history_lock:
+            return list(self.event_history)
+
+    def _type_snapshot(self, event_type: Any) -> List[Event]:
+        with self._history_lock:
+            return list(self._by_type_index.get(_enum_value(event_type), ()))
+
     def get_events(self, event_type: Optional[EventType] = None) -> List[Event]:
         if event_type:
-            return [e for e in self.event_history if e.event_type == event_type]
-        return self.event_history
+            return self._type_snapshot(event_type)
+        return self._history_snapshot()
 
     def get_events_since(self, timestamp: datetime, event_type: Optional[EventType] = None) -> List[Event]:
-        events = [e for e in self.event_history if e.timestamp >= timestamp]
         if event_type:
-            events = [e for e in events if e.event_type == event_type]
+            events = self._type_snapshot(event_type)
+        else:
+            with self._history_lock:
+                # Everything before the first running max >= timestamp is older than it.
+                start = bisect_left(self._ts_max, timestamp, lo=self._ts_offset)
+                events = list(itertools.islice(reversed(self.event_history), len(self._ts_max) - start))
+            events.reverse()
+        return [e for e in events if e.timestamp >= timestamp]
+
+    def get_events_since_seq(self, last_seq: int) -> List[Event]:
+        """Events emitted after the one numbered ``last_seq`` that are still in history."""
+        with self._history_lock:
+            history = self.event_history
+            # Sequence numbers are consecutive in history order, so the tail length is known.
+            newer = history[-1].seq - last_seq if history else 0
+            events = list(itertools.islice(reversed(history), min(newer, len(history)))) if newer > 0 else []
+        events.reverse()
         return events
 
     def clear_history(self):
-        self.event_history.clear()
+        with self._history_lock:
+            self.event_history.clear()
+            self.version += 1
+            self._type_counts.clear()
+            self._severity_counts.clear()
+            self._by_type_index.clear()
+            self._ts_max.clear()
+            self._ts_offset = 0
 
     def get_stats(self) -> Dict[str, Any]:
-        by_type = {}
-        by_severity = {}
-        for event in self.event_history:
-            et_value = event.event_type.value if hasattr(event.event_type, "value") else str(event.event_type)
-            by_type[event.event_type.value] = by_type.get(et_value, 0) + 1
-            by_severity[event.severity.value] = by_severity.get(event.severity.value, 0) + 1
-
-        return {
-            "total_events": len(self.event_history),
-            "by_type": by_type,
-            "by_severity": by_severity,
-        }
+        with self._history_lock:
+            return {
+                "total_events": len(self.event_history),
+                "events_dropped": self.events_dropped,
+                "by_type": {k: v for k, v in self._type_counts.items() if v},
+                "by_severity": {k: v for k, v in self._severity_counts.items() if v},
+            }
+
+    def _forget(self, event: Event):
+        """Drop an event that the ring buffer is about to evict from counts and index."""
+        self._count(event, -1)
+        type_events = self._by_type_index[event.type_value]
+        type_events.popleft()
+        if not type_events:
+            del self._by_type_index[event.type_value]
+
+    def _count(self, event: Event, delta: int):
+        self._type_counts[event.type_value] += delta
+        self._severity_counts[event.severity_value] += delta
@@ -1,39 +1,106 @@
-import json
+import logging
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Dict, Any, Optional, List
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from prometheus_client import CollectorRegistry, Counter as PrometheusCounter, Gauge as PrometheusGauge, generate_latest
+except ImportError:  # optional: only PrometheusExporter needs it
+    CollectorRegistry = PrometheusCounter = PrometheusGauge = generate_latest = None
+
 from .metrics import Metric
 from .events import Event
 
 
+# orjson writes naive datetimes in the same form as datetime.isoformat(); tags and
+# event data are caller-supplied, so non-string keys are allowed.
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _orjson_default(obj):
+    """orjson hook: events are serialized as they are reached, so no list of dicts is built."""
+    if isinstance(obj, Event):
+        return obj.to_dict()
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+_EVENT_OPTIONS = _ORJSON_OPTIONS | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
 class MetricsExporter(ABC):
+    logger = logging.getLogger(__name__)
+
     @abstractmethod
     def export(self, metrics: Dict[str, Metric]) -> bool:
         pass
 
     @abstractmethod
     def export_events(self, events: List[Event]) -> bool:
-        pass
+        """Deliver events and return True on success.
+
+        Any other result, including None, is a failed delivery: the collector keeps
+        its cursor and offers the same events again on the next export, and skips
+        them after ``MAX_EVENT_EXPORT_ATTEMPTS`` consecutive failures.
+        """
+
+    def close(self):
+        """Release any resources held by the exporter; it may be used again afterwards."""
 
 
 class JSONExporter(MetricsExporter):
+    """Appends exports to ``metrics.jsonl`` and ``events.jsonl`` in ``output_dir``.
+
+    Each metrics line holds one metric as of one export (``timestamp`` + ``name``);
+    each events line holds one event.
+    """
+
     def __init__(self, output_dir: str = "."):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.metrics_file = self.output_dir / "metrics.jsonl"
+        self.events_file = self.output_dir / "events.jsonl"
+        self._handles: Dict[Path, IO[bytes]] = {}
+
+    def _append_lines(self, path: Path, records, option: int = _ORJSON_OPTIONS):
+        # Serialize everything first: a record that fails to encode must not leave the
+        # earlier ones on disk, or the collector's retry would write them twice.
+        option |= orjson.OPT_APPEND_NEWLINE
+        blob = b"".join(orjson.dumps(record, default=_orjson_default, option=option) for record in records)
+        handle = self._handles.get(path)
+        if handle is None:
+            handle = self._handles[path] = open(path, "ab", buffering=1 << 16)
+        handle.write(blob)
+        handle.flush()
+
+    def close(self):
+        for handle in self._handles.values():
+            handle.flush()
+            os.fsync(handle.fileno())
+            handle.close()
+        self._handles.clear()
 
     def export(self, metrics: Dict[str, Metric]) -> bool:
         try:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            output_file = self.output_dir / f"metrics_{timestamp}.json"
-
-            data = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "metrics": {},
-            }
+            timestamp = datetime.utcnow().isoformat()
+            records = []
 
             for name, metric in metrics.items():
                 metric_data = {
+                    "timestamp": timestamp,
+                    "name": name,
                     "definition": {
                         "name": metric.definition.name,
                         "type": metric.definition.type.value,
@@ -52,55 +119,43 @@ class JSONExporter(MetricsExporter):
                 elif hasattr(metric, "get_value"):
                     metric_data["value"] = metric.get_value()
 
-                for value in metric.values:
-                    metric_data["values"].append({
-                        "value": value.value,
-                        "timestamp": value.timestamp.isoformat(),
-                        "tags": value.tags,
-                    })
-
-                data["metrics"][name] = metric_data
+                # Whole columns at once: one copy under the metric lock, one vectorized timestamp format.
+                values, stamps_ns, tags = metric.snapshot()
+                stamps = np.datetime_as_string((stamps_ns // 1000).astype("datetime64[us]"), unit="us").tolist()
+                metric_data["values"] = [
+                    {"value": value, "timestamp": stamp, "tags": tag or {}}
+                    for value, stamp, tag in zip(values.tolist(), stamps, tags)
+                ]
 
-            with open(output_file, "w") as f:
-                json.dump(data, f, indent=2)
+                records.append(metric_data)
 
+            self._append_lines(self.metrics_file, records)
             return True
-        except Exception as e:
-            print(f"Error exporting metrics to JSON: {e}")
+        except Exception:
+            self.logger.exception("Error exporting metrics to JSON")
             return False
 
     def export_events(self, events: List[Event]) -> bool:
         try:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            output_file = self.output_dir / f"events_{timestamp}.json"
-
-            data = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "events": [event.to_dict() for event in events],
-            }
-
-            with open(output_file, "w") as f:
-                json.dump(data, f, indent=2)
-
+            self._append_lines(self.events_file, events, option=_EVENT_OPTIONS)
             return True
-        except Exception as e:
-            print(f"Error exporting events to JSON: {e}")
+        except Exception:
+            self.logger.exception("Error exporting events to JSON")
             return False
 
 
 class PrometheusExporter(MetricsExporter):
     def __init__(self, registry=None):
-        try:
-            from prometheus_client import CollectorRegistry, Gauge, Counter as PrometheusCounter
-            self.registry = registry or CollectorRegistry()
-            self.prometheus_metrics = {}
-        except ImportError:
+        if CollectorRegistry is None:
             raise ImportError("prometheus-client is required for PrometheusExporter")
+        self.registry = registry or CollectorRegistry()
+        self.prometheus_metrics = {}
+        # Last value pushed per metric, so unchanged metrics are skipped and counters get deltas.
+        self._last_values: Dict[str, float] = {}
+        self._event_counter = None
 
     def export(self, metrics: Dict[str, Metric]) -> bool:
         try:
-            from prometheus_client import Gauge, Counter as PrometheusCounter, generate_latest
-
             for name, metric in metrics.items():
                 if name not in self.prometheus_metrics:
                     if "counter" in metric.definition.type.value.lower():
@@ -110,7 +165,7 @@ class PrometheusExporter(MetricsExporter):
                             registry=self.registry,
                         )
                     else:
-                        self.prometheus_metrics[name] = Gauge(
+                        self.prometheus_metrics[name] = PrometheusGauge(
                             name=name,
                             documentation=metric.definition.description,
                             registry=self.registry,
@@ -119,38 +174,43 @@ class PrometheusExporter(MetricsExporter):
                 prom_metric = self.prometheus_metrics[name]
 
                 if hasattr(metric, "get_total"):
-                    prom_metric.set(metric.get_total())
+                    value = metric.get_total()
+                    delta = value - self._last_values.get(name, 0)
+                    if delta > 0:
+                        prom_metric.inc(delta)
                 elif hasattr(metric, "get_value"):
-                    prom_metric.set(metric.get_value())
+                    value = metric.get_value()
+                    if self._last_values.get(name) != value:
+                        prom_metric.set(value)
+                else:
+                    continue
+                self._last_values[name] = value
 
-            output = generate_latest(self.registry).decode("utf-8")
             return True
-        except Exception as e:
-            print(f"Error exporting metrics to Prometheus: {e}")
+        except Exception:
+            self.logger.exception("Error exporting metrics to Prometheus")
             return False
 
     def export_events(self, events: List[Event]) -> bool:
         try:
-            from prometheus_client import Counter, generate_latest
-
-            event_counter = Counter(
-                "events_total",
-                "Total number of events",
-                ["event_type", "severity"],
-                registry=self.registry,
-            )
+            if self._event_counter is None:
+                self._event_counter = PrometheusCounter(
+                    "events_total",
+                    "Total number of events",
+                    ["event_type", "severity"],
+                    registry=self.registry,
+                )
 
             for event in events:
-                event_counter.labels(event_type=event.event_type.value, severity=event.severity.value).inc()
+                self._event_counter.labels(event_type=event.type_value, severity=event.severity_value).inc()
 
             return True
-        except Exception as e:
-            print(f"Error exporting events to Prometheus: {e}")
+        except Exception:
+            self.logger.exception("Error exporting events to Prometheus")
             return False
 
     def get_metrics_output(self) -> str:
         try:
-            from prometheus_client import generate_latest
             return generate_latest(self.registry).decode("utf-8")
         except Exception:
             return ""
@@ -159,11 +219,26 @@ class PrometheusExporter(MetricsExporter):
 class WebhookExporter(MetricsExporter):
     def __init__(self, webhook_url: str):
         self.webhook_url = webhook_url
+        # One pooled keep-alive session, so periodic exports reuse the TCP/TLS connection.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.1))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self):
+        self._session.close()
+
+    def _post(self, payload: Dict[str, Any], option: int = _ORJSON_OPTIONS) -> bool:
+        response = self._session.post(
+            self.webhook_url,
+            data=orjson.dumps(payload, default=_orjson_default, option=option),
+            headers=_JSON_HEADERS,
+            timeout=10,
+        )
+        return response.status_code < 400
 
     def export(self, metrics: Dict[str, Metric]) -> bool:
         try:
-            import requests
-
             payload = {
                 "timestamp": datetime.utcnow().isoformat(),
                 "metrics": {},
@@ -180,36 +255,48 @@ class WebhookExporter(MetricsExporter):
                 elif hasattr(metric, "get_value"):
                     payload["metrics"][name]["value"] = metric.get_value()
 
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
-            return response.status_code < 400
-        except Exception as e:
-            print(f"Error exporting metrics to webhook: {e}")
+            return self._post(payload)
+        except Exception:
+            self.logger.exception("Error exporting metrics to webhook")
             return False
 
     def export_events(self, events: List[Event]) -> bool:
         try:
-            import requests
-
             payload = {
                 "timestamp": datetime.utcnow().isoformat(),
-                "events": [event.to_dict() for event in events],
+                "events": events,
             }
 
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
-            return response.status_code < 400
-        except Exception as e:
-            print(f"Error exporting events to webhook: {e}")
+            return self._post(payload, option=_EVENT_OPTIONS)
+        except Exception:
+            self.logger.exception("Error exporting events to webhook")
             return False
 
 
 class BatchExporter(MetricsExporter):
+    """Fans exports out to several exporters in parallel; the slowest one bounds the latency."""
+
     def __init__(self, exporters: List[MetricsExporter]):
         self.exporters = exporters
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _fan_out(self, method: str, payload) -> bool:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=max(1, len(self.exporters)), thread_name_prefix="batch-exporter"
+            )
+        futures = [self._pool.submit(getattr(exporter, method), payload) for exporter in self.exporters]
+        return all([future.result() for future in futures])
 
     def export(self, metrics: Dict[str, Metric]) -> bool:
-        results = [exporter.export(metrics) for exporter in self.exporters]
-        return all(results)
+        return self._fan_out("export", metrics)
 
     def export_events(self, events: List[Event]) -> bool:
-        results = [exporter.export_events(events) for exporter in self.exporters]
-        return all(results)
+        return self._fan_out("export_events", events)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        for exporter in self.exporters:
+            exporter.close()
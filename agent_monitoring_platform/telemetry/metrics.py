@@ -1,9 +1,17 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 from enum import Enum
-from datetime import datetime, timedelta
-import statistics
-from threading import RLock
+from datetime import datetime, timedelta, timezone
+import itertools
+import math
+from bisect import bisect_left
+import time
+from threading import Lock
+
+import numpy as np
+
+from utils.helpers import DATACLASS_SLOTS
 
 
 class MetricType(str, Enum):
@@ -22,23 +30,261 @@ class MetricDefinition:
     tags: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MetricValue:
     value: float
     timestamp: datetime = field(default_factory=datetime.utcnow)
-    tags: Dict[str, str] = field(default_factory=dict)
+    tags: Mapping[str, str] = field(default_factory=dict)
+
+
+# Shared read-only tags for untagged samples, so views allocate no per-value dict.
+_EMPTY_TAGS: Mapping[str, str] = MappingProxyType({})
+
+
+@dataclass(**DATACLASS_SLOTS)
+class StatsBucket:
+    """count/sum/min/max digest of the values recorded in [start, end)."""
+
+    start: float
+    end: float
+    span: int = 1
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = float("-inf")
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, older: "StatsBucket"):
+        """Fold the adjacent, older bucket into this one."""
+        self.start = older.start
+        self.span += older.span
+        self.count += older.count
+        self.total += older.total
+        self.min = min(self.min, older.min)
+        self.max = max(self.max, older.max)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": datetime.utcfromtimestamp(self.start).isoformat(),
+            "end": datetime.utcfromtimestamp(self.end).isoformat(),
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else 0,
+            "max": self.max if self.count else 0,
+        }
+
+
+class DecayingAggregator:
+    """Time-decaying rollup of a metric in O(log T) buckets.
+
+    Each closed resolution interval becomes a bucket of span 1; whenever three
+    buckets share a span, the two oldest merge into one of twice the span.
+    Spans therefore grow as 1, 1, 2, 2, 4, 4, ... with age, so recent data keeps
+    fine resolution while 90 days at one-minute resolution fit in ~34 buckets.
+    """
+
+    def __init__(self, resolution_s: float = 60.0):
+        self.resolution_s = resolution_s
+        # Closed buckets, newest first; the open bucket collects the current interval.
+        self.buckets: List[StatsBucket] = []
+        self._open: Optional[StatsBucket] = None
+
+    def add(self, value: float, ts: Optional[float] = None):
+        ts = time.time() if ts is None else ts
+        current = self._open
+        if current is None or ts >= current.end:
+            if current is not None:
+                self._close(current)
+            start = ts - ts % self.resolution_s
+            current = self._open = StatsBucket(start=start, end=start + self.resolution_s)
+        current.add(value)
+
+    def add_many(self, values: np.ndarray, ts: Optional[float] = None):
+        """Add a batch of values that share one timestamp."""
+        if not values.size:
+            return
+        self.add(float(values[0]), ts)
+        if values.size > 1:
+            rest = values[1:]
+            bucket = self._open
+            bucket.count += rest.size
+            bucket.total += float(rest.sum())
+            bucket.min = min(bucket.min, float(rest.min()))
+            bucket.max = max(bucket.max, float(rest.max()))
+
+    def _close(self, bucket: StatsBucket):
+        buckets = self.buckets
+        buckets.insert(0, bucket)
+        i = 0
+        while i + 2 < len(buckets) and buckets[i].span == buckets[i + 2].span:
+            # Three buckets of one span: merge the two oldest and carry upward.
+            buckets[i + 1].merge(buckets.pop(i + 2))
+            i += 1
+
+    def drop_before(self, cutoff: float):
+        """Drop the oldest buckets that lie entirely before ``cutoff``."""
+        while self.buckets and self.buckets[-1].end <= cutoff:
+            self.buckets.pop()
+
+    def summarize(self, since: Optional[float] = None) -> Dict[str, float]:
+        """Aggregate buckets ending after ``since`` (bucket-granular at the edge)."""
+        count, total = 0, 0.0
+        lo, hi = float("inf"), float("-inf")
+        candidates = [self._open] if self._open is not None else []
+        candidates.extend(self.buckets)
+        for bucket in candidates:
+            if since is not None and bucket.end <= since:
+                break
+            count += bucket.count
+            total += bucket.total
+            lo = min(lo, bucket.min)
+            hi = max(hi, bucket.max)
+        if not count:
+            return {}
+        return {"count": count, "sum": total, "mean": total / count, "min": lo, "max": hi}
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Buckets oldest first, including the open one."""
+        buckets = self.buckets[::-1]
+        if self._open is not None:
+            buckets.append(self._open)
+        return [b.to_dict() for b in buckets]
+
+
+_EPOCH = datetime(1970, 1, 1)
+_NS_PER_US = 1000
+# Sample timestamps come from the monotonic clock shifted onto the epoch once per process:
+# they never step backwards (the arrays stay sorted for searchsorted) yet convert to wall time.
+_MONOTONIC_TO_EPOCH_NS = time.time_ns() - time.monotonic_ns()
+
+
+def _now_ns() -> int:
+    return time.monotonic_ns() + _MONOTONIC_TO_EPOCH_NS
+
+
+def _to_ns(ts: datetime) -> int:
+    return (ts - _EPOCH) // timedelta(microseconds=1) * _NS_PER_US
+
+
+def _from_ns(ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(ns) // _NS_PER_US)
 
 
 class Metric:
-    def __init__(self, definition: MetricDefinition):
+    """Recorded samples live in parallel arrays (value, wall-clock ns, tags) in arrival order."""
+
+    # Samples keep full double precision: they are exported raw and feed percentiles that
+    # must agree with the exact min/max, and counter values need integer exactness past 2**24.
+    VALUE_DTYPE = np.float64
+
+    def __init__(self, definition: MetricDefinition, capacity: int = 64):
         self.definition = definition
-        self.values: List[MetricValue] = []
-        self._lock = RLock()
+        self._values = np.empty(capacity, dtype=self.VALUE_DTYPE)
+        self._ts = np.empty(capacity, dtype=np.int64)
+        self._tags: List[Optional[Dict[str, str]]] = []
+        self._n = 0
+        # Lifetime aggregates kept per record, so only percentiles need the raw values.
+        self._min = float("inf")
+        self._max = float("-inf")
+        # Welford running mean and sum of squared deviations; a raw sum of squares
+        # cancels catastrophically once the values sit far from zero.
+        self._moment_count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.rollup = DecayingAggregator()
+        # Bumped on every change to the samples, so cached snapshots can tell they are stale.
+        self._epoch = 0
+        # Taken exactly once per public call (subclasses extend _record_locked), so a plain Lock suffices.
+        self._lock = Lock()
 
     def record(self, value: float, tags: Optional[Dict[str, str]] = None):
-        metric_value = MetricValue(value=value, tags=tags or {})
         with self._lock:
-            self.values.append(metric_value)
+            self._record_locked(value, tags)
+
+    def _record_locked(self, value: float, tags: Optional[Dict[str, str]]):
+        n = self._n
+        if n == self._values.size:
+            self._grow()
+        ts_ns = _now_ns()
+        self._values[n] = value
+        self._ts[n] = ts_ns
+        self._tags.append(tags or None)
+        self._n = n + 1
+        self._epoch += 1
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+        self._moment_count += 1
+        delta = value - self._mean
+        self._mean += delta / self._moment_count
+        self._m2 += delta * (value - self._mean)
+        self.rollup.add(value, ts_ns / 1e9)
+
+    def _append_many(self, values: np.ndarray, tags: Optional[Dict[str, str]] = None):
+        """Store a batch of samples stamped with one timestamp; caller holds the lock."""
+        k = values.size
+        n = self._n
+        while n + k > self._values.size:
+            self._grow()
+        ts_ns = _now_ns()
+        self._values[n : n + k] = values
+        self._ts[n : n + k] = ts_ns
+        self._tags.extend([tags or None] * k)
+        self._n = n + k
+        self._epoch += 1
+        self._min = min(self._min, float(values.min()))
+        self._max = max(self._max, float(values.max()))
+        # Merge the batch's own mean and M2 into the running ones (Chan et al.).
+        batch_mean = float(values.mean())
+        deviations = values - batch_mean
+        count = self._moment_count + k
+        delta = batch_mean - self._mean
+        self._mean += delta * k / count
+        self._m2 += float(np.dot(deviations, deviations)) + delta * delta * self._moment_count * k / count
+        self._moment_count = count
+        self.rollup.add_many(values, ts_ns / 1e9)
+
+    def _moments(self, count: int, total: float) -> Dict[str, float]:
+        """count/sum/mean/stddev/min/max from the running aggregates (population stddev)."""
+        mean = total / count if count > 0 else 0
+        variance = max(self._m2 / self._moment_count, 0.0) if self._moment_count else 0.0
+        return {
+            "count": count,
+            "sum": total,
+            "mean": mean,
+            "stddev": math.sqrt(variance) if variance > 0 else 0.0,
+            "min": self._min,
+            "max": self._max,
+        }
+
+    def _grow(self):
+        size = self._values.size * 2
+        for name in ("_values", "_ts"):
+            old = getattr(self, name)
+            grown = np.empty(size, dtype=old.dtype)
+            grown[: self._n] = old[: self._n]
+            setattr(self, name, grown)
+
+    def _view(self, lo: int, hi: int) -> List[MetricValue]:
+        values, ts, tags = self._values, self._ts, self._tags
+        return [
+            MetricValue(value=float(values[i]), timestamp=_from_ns(ts[i]), tags=tags[i] or _EMPTY_TAGS)
+            for i in range(lo, hi)
+        ]
+
+    @property
+    def values(self) -> List[MetricValue]:
+        """Recorded samples as MetricValue objects, built on access."""
+        with self._lock:
+            return self._view(0, self._n)
 
     def get_values(self, start_time: Optional[datetime] = None, duration: Optional[timedelta] = None) -> List[MetricValue]:
         if not start_time:
@@ -49,13 +295,40 @@ class Metric:
         else:
             end_time = datetime.utcnow()
 
-        return [v for v in self.values if start_time <= v.timestamp <= end_time]
+        with self._lock:
+            ts = self._ts[: self._n]
+            lo = int(np.searchsorted(ts, _to_ns(start_time), side="left"))
+            hi = int(np.searchsorted(ts, _to_ns(end_time), side="right"))
+            return self._view(lo, hi)
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray, List[Optional[Dict[str, str]]]]:
+        """Copies of the (values, epoch-ns timestamps, tags) columns, taken under one lock."""
+        with self._lock:
+            n = self._n
+            return self._values[:n].copy(), self._ts[:n].copy(), self._tags[:n]
+
+    def get_rollup(self, since: Optional[datetime] = None) -> Dict[str, float]:
+        with self._lock:
+            return self.rollup.summarize(since.replace(tzinfo=timezone.utc).timestamp() if since else None)
 
-    def cleanup_old_values(self, retention: timedelta):
-        cutoff = datetime.utcnow() - retention
+    def cleanup_old_values(self, retention: timedelta, raw_retention: Optional[timedelta] = None):
+        """Drop rollup buckets older than ``retention`` and raw values older than ``raw_retention``."""
+        now = datetime.utcnow()
+        cutoff = now - (raw_retention if raw_retention is not None else retention)
         with self._lock:
-            # Atomic replacement protected by lock
-            self.values = [v for v in self.values if v.timestamp > cutoff]
+            rollup_buckets = len(self.rollup.buckets)
+            self.rollup.drop_before((now - retention).replace(tzinfo=timezone.utc).timestamp())
+            if len(self.rollup.buckets) != rollup_buckets:
+                self._epoch += 1
+            n = self._n
+            expired = int(np.searchsorted(self._ts[:n], _to_ns(cutoff), side="right"))
+            if expired:
+                kept = n - expired
+                self._values[:kept] = self._values[expired:n]
+                self._ts[:kept] = self._ts[expired:n]
+                del self._tags[:expired]
+                self._n = kept
+                self._epoch += 1
 
     def to_dict(self) -> Dict[str, Any]:
         with self._lock:
@@ -66,20 +339,25 @@ class Metric:
                     "description": self.definition.description,
                     "unit": self.definition.unit,
                 },
-                "values_count": len(self.values),
+                "values_count": self._n,
+                "rollup": self.rollup.summarize(),
             }
 
 
 class Counter(Metric):
-    def __init__(self, definition: MetricDefinition):
+    def __init__(self, definition: MetricDefinition, record_history: bool = True):
         if definition.type != MetricType.COUNTER:
             raise ValueError(f"Counter must have type COUNTER, got {definition.type}")
         super().__init__(definition)
         self.total = 0
+        # Without history only the total is kept: increment stores no sample, tags or rollup.
+        self.record_history = record_history
 
     def increment(self, amount: float = 1, tags: Optional[Dict[str, str]] = None):
-        self.total += amount
-        self.record(amount, tags)
+        with self._lock:
+            self.total += amount
+            if self.record_history:
+                self._record_locked(amount, tags)
 
     def get_total(self) -> float:
         with self._lock:
@@ -96,7 +374,7 @@ class Gauge(Metric):
     def set(self, value: float, tags: Optional[Dict[str, str]] = None):
         with self._lock:
             self.current_value = value
-            self.record(value, tags)
+            self._record_locked(value, tags)
 
     def get_value(self) -> float:
         with self._lock:
@@ -105,12 +383,12 @@ class Gauge(Metric):
     def increment(self, amount: float = 1, tags: Optional[Dict[str, str]] = None):
         with self._lock:
             self.current_value += amount
-            self.record(self.current_value, tags)
+            self._record_locked(self.current_value, tags)
 
     def decrement(self, amount: float = 1, tags: Optional[Dict[str, str]] = None):
         with self._lock:
             self.current_value -= amount
-            self.record(self.current_value, tags)
+            self._record_locked(self.current_value, tags)
 
 
 class Histogram(Metric):
@@ -118,46 +396,102 @@ class Histogram(Metric):
         if definition.type != MetricType.HISTOGRAM:
             raise ValueError(f"Histogram must have type HISTOGRAM, got {definition.type}")
         super().__init__(definition)
-        self.buckets = buckets or [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+        self.buckets = sorted(buckets or [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0])
         self.sum = 0
         self.count = 0
-
-    def record(self, value: float, tags: Optional[Dict[str, str]] = None):
+        # Sorted copy of the samples as of an epoch, shared by percentile queries.
+        self._sorted_cache: Optional[Tuple[int, np.ndarray]] = None
+        # Per-bucket counts (value <= upper bound), with a final +Inf overflow slot.
+        self._bucket_counts = [0] * (len(self.buckets) + 1)
+        # Evenly spaced bounds map a value to its bucket arithmetically instead of by search.
+        diffs = np.diff(self.buckets)
+        self._uniform = len(self.buckets) > 1 and bool(np.allclose(diffs, diffs[0], rtol=1e-9, atol=0)) and diffs[0] > 0
+        if self._uniform:
+            self._lo = self.buckets[0]
+            self._inv_width = 1.0 / float(diffs[0])
+
+    def _bucket_index(self, value: float) -> int:
+        # NaN compares false against every bound, so bisect would drop it in bucket 0;
+        # it goes to the +Inf overflow slot, where np.searchsorted in record_many puts it.
+        if value != value:
+            return len(self.buckets)
+        # +-inf cannot go through the arithmetic path (ceil raises), so they bisect too.
+        if not self._uniform or not math.isfinite(value):
+            return bisect_left(self.buckets, value)
+        buckets = self.buckets
+        nb = len(buckets)
+        idx = min(max(math.ceil((value - self._lo) * self._inv_width), 0), nb)
+        # Nudge by one where float rounding lands a value next to an edge in the wrong bucket.
+        if idx < nb and value > buckets[idx]:
+            idx += 1
+        elif idx > 0 and value <= buckets[idx - 1]:
+            idx -= 1
+        return idx
+
+    def _record_locked(self, value: float, tags: Optional[Dict[str, str]]):
+        # Resolve the bucket first so a bad value cannot leave the sample half-recorded.
+        bucket = self._bucket_index(value)
+        super()._record_locked(value, tags)
+        self.sum += value
+        self.count += 1
+        self._bucket_counts[bucket] += 1
+
+    def record_many(self, values, tags: Optional[Dict[str, str]] = None):
+        """Record a batch of values in one locked, vectorized pass."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not values.size:
+            return
+        idx = np.searchsorted(self.buckets, values, side="left")
+        counts = np.bincount(idx, minlength=len(self._bucket_counts))
+        with self._lock:
+            self._append_many(values, tags)
+            self.sum += float(values.sum())
+            self.count += values.size
+            for i in np.flatnonzero(counts):
+                self._bucket_counts[i] += int(counts[i])
+
+    def get_buckets(self) -> List[Tuple[float, int]]:
+        """Cumulative (upper bound, count) pairs ending with +Inf, Prometheus style."""
         with self._lock:
-            super().record(value, tags)
-            self.sum += value
-            self.count += 1
+            counts = list(self._bucket_counts)
+        return list(zip([*self.buckets, float("inf")], itertools.accumulate(counts)))
+
+    _PERCENTILES = (50, 90, 95, 99)
 
     def get_statistics(self) -> Dict[str, float]:
         with self._lock:
-            if not self.values:
+            n = self._n
+            if not n:
                 return {}
 
-            values = [v.value for v in self.values]
-            values.sort()
-            
-            current_count = self.count
-            current_sum = self.sum
-
-            return {
-                "count": current_count,
-                "sum": current_sum,
-                "mean": current_sum / current_count if current_count > 0 else 0,
-                "min": values[0] if values else 0,
-                "max": values[-1] if values else 0,
-                "median": statistics.median(values) if values else 0,
-                "p50": self._percentile(values, 50),
-                "p90": self._percentile(values, 90),
-                "p95": self._percentile(values, 95),
-                "p99": self._percentile(values, 99),
-            }
+            ranks = {p: min(n * p // 100, n - 1) for p in self._PERCENTILES}
+            values = self._fresh_sorted()
+            if values is None:
+                # Only a handful of order statistics are needed, so select them instead of sorting.
+                kths = sorted({(n - 1) // 2, n // 2, *ranks.values()})
+                values = np.partition(self._values[:n], kths)
+            stats = self._moments(self.count, self.sum)
+
+        stats["median"] = float(values[(n - 1) // 2] + values[n // 2]) / 2
+        for p, rank in ranks.items():
+            stats[f"p{p}"] = float(values[rank])
+        return stats
+
+    def get_percentiles(self, ps: List[float]) -> Dict[float, float]:
+        """Any number of percentiles from one sorted copy, reused until the samples change."""
+        with self._lock:
+            n = self._n
+            if not n:
+                return {}
+            ordered = self._fresh_sorted()
+            if ordered is None:
+                ordered = np.sort(self._values[:n])
+                self._sorted_cache = (self._epoch, ordered)
+        return {p: float(ordered[min(int(n * p / 100), n - 1)]) for p in ps}
 
-    @staticmethod
-    def _percentile(values: List[float], percentile: float) -> float:
-        if not values:
-            return 0
-        idx = int(len(values) * percentile / 100)
-        return values[min(idx, len(values) - 1)]
+    def _fresh_sorted(self) -> Optional[np.ndarray]:
+        cached = self._sorted_cache
+        return cached[1] if cached is not None and cached[0] == self._epoch else None
 
 
 class Summary(Metric):
@@ -168,126 +502,122 @@ class Summary(Metric):
         self.sum = 0
         self.count = 0
 
-    def record(self, value: float, tags: Optional[Dict[str, str]] = None):
-        with self._lock:
-            super().record(value, tags)
-            self.sum += value
-            self.count += 1
+    def _record_locked(self, value: float, tags: Optional[Dict[str, str]]):
+        super()._record_locked(value, tags)
+        self.sum += value
+        self.count += 1
 
     def get_summary(self) -> Dict[str, float]:
         with self._lock:
-            if not self.values:
+            if not self._n:
                 return {}
-
-            values = [v.value for v in self.values]
-            return {
-                "count": self.count,
-                "sum": self.sum,
-                "mean": self.sum / self.count if self.count > 0 else 0,
-                "min": min(values) if values else 0,
-                "max": max(values) if values else 0,
-            }
+            return self._moments(self.count, self.sum)
 
 
 class MetricsRegistry:
     def __init__(self):
         self.metrics: Dict[str, Metric] = {}
-        self._lock = RLock()
+        # Per-type views of self.metrics, so get-or-create is one dict lookup with no type check.
+        self._counters: Dict[str, Counter] = {}
+        self._gauges: Dict[str, Gauge] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._summaries: Dict[str, Summary] = {}
+        self._lock = Lock()
+        self._snapshot_cache: Optional[Tuple[int, Dict[str, Dict[str, Any]]]] = None
+
+    def _typed_index(self, metric: Metric) -> Optional[Dict[str, Any]]:
+        for cls, index in (
+            (Counter, self._counters),
+            (Gauge, self._gauges),
+            (Histogram, self._histograms),
+            (Summary, self._summaries),
+        ):
+            if isinstance(metric, cls):
+                return index
+        return None
 
     def register(self, metric: Metric):
         with self._lock:
             if metric.definition.name in self.metrics:
                 raise ValueError(f"Metric {metric.definition.name} already registered")
             self.metrics[metric.definition.name] = metric
+            index = self._typed_index(metric)
+            if index is not None:
+                index[metric.definition.name] = metric
 
     def get_metric(self, name: str) -> Optional[Metric]:
         with self._lock:
             return self.metrics.get(name)
 
-    def counter(self, name: str, description: str, unit: Optional[str] = None) -> Counter:
+    def _create(self, index: Dict[str, Any], name: str, kind: str, build) -> Any:
         with self._lock:
+            existing = index.get(name)
+            if existing is not None:
+                return existing
             if name in self.metrics:
-                metric = self.metrics[name]
-                if not isinstance(metric, Counter):
-                    raise ValueError(f"Metric {name} already exists but is not a Counter")
-                return metric
-                
-            definition = MetricDefinition(
-                name=name,
-                type=MetricType.COUNTER,
-                description=description,
-                unit=unit,
-            )
-            counter = Counter(definition)
-            self.metrics[name] = counter
-            return counter
+                raise ValueError(f"Metric {name} already exists but is not a {kind}")
+            metric = build()
+            self.metrics[name] = metric
+            index[name] = metric
+            return metric
+
+    def counter(
+        self, name: str, description: str, unit: Optional[str] = None, record_history: bool = True
+    ) -> Counter:
+        existing = self._counters.get(name)
+        if existing is not None:
+            return existing
+        definition = MetricDefinition(name=name, type=MetricType.COUNTER, description=description, unit=unit)
+        return self._create(self._counters, name, "Counter", lambda: Counter(definition, record_history))
 
     def gauge(self, name: str, description: str, unit: Optional[str] = None) -> Gauge:
-        with self._lock:
-            if name in self.metrics:
-                metric = self.metrics[name]
-                if not isinstance(metric, Gauge):
-                    raise ValueError(f"Metric {name} already exists but is not a Gauge")
-                return metric
-
-            definition = MetricDefinition(
-                name=name,
-                type=MetricType.GAUGE,
-                description=description,
-                unit=unit,
-            )
-            gauge = Gauge(definition)
-            self.metrics[name] = gauge
-            return gauge
+        existing = self._gauges.get(name)
+        if existing is not None:
+            return existing
+        definition = MetricDefinition(name=name, type=MetricType.GAUGE, description=description, unit=unit)
+        return self._create(self._gauges, name, "Gauge", lambda: Gauge(definition))
 
     def histogram(
         self, name: str, description: str, unit: Optional[str] = None, buckets: Optional[List[float]] = None
     ) -> Histogram:
-        with self._lock:
-            if name in self.metrics:
-                metric = self.metrics[name]
-                if not isinstance(metric, Histogram):
-                    raise ValueError(f"Metric {name} already exists but is not a Histogram")
-                return metric
-
-            definition = MetricDefinition(
-                name=name,
-                type=MetricType.HISTOGRAM,
-                description=description,
-                unit=unit,
-            )
-            histogram = Histogram(definition, buckets)
-            self.metrics[name] = histogram
-            return histogram
+        existing = self._histograms.get(name)
+        if existing is not None:
+            return existing
+        definition = MetricDefinition(name=name, type=MetricType.HISTOGRAM, description=description, unit=unit)
+        return self._create(self._histograms, name, "Histogram", lambda: Histogram(definition, buckets))
 
     def summary(self, name: str, description: str, unit: Optional[str] = None) -> Summary:
+        existing = self._summaries.get(name)
+        if existing is not None:
+            return existing
+        definition = MetricDefinition(name=name, type=MetricType.SUMMARY, description=description, unit=unit)
+        return self._create(self._summaries, name, "Summary", lambda: Summary(definition))
+
+    @property
+    def version(self) -> int:
+        """Grows whenever a metric is registered, recorded to or trimmed."""
         with self._lock:
-            if name in self.metrics:
-                metric = self.metrics[name]
-                if not isinstance(metric, Summary):
-                    raise ValueError(f"Metric {name} already exists but is not a Summary")
-                return metric
-
-            definition = MetricDefinition(
-                name=name,
-                type=MetricType.SUMMARY,
-                description=description,
-                unit=unit,
-            )
-            summary = Summary(definition)
-            self.metrics[name] = summary
-            return summary
+            metrics = list(self.metrics.values())
+        return len(metrics) + sum(metric._epoch for metric in metrics)
 
     def get_all_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of every metric; reused until the registry version changes, so do not mutate it."""
+        version = self.version
+        cached = self._snapshot_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
         with self._lock:
             # Create a snapshot of current metrics
             metrics_snapshot = list(self.metrics.items())
             
-        return {name: metric.to_dict() for name, metric in metrics_snapshot}
+        snapshot = {name: metric.to_dict() for name, metric in metrics_snapshot}
+        self._snapshot_cache = (version, snapshot)
+        return snapshot
 
-    def cleanup_old_values(self, retention: timedelta):
+    def cleanup_old_values(self, retention: timedelta, raw_retention: Optional[timedelta] = None):
         with self._lock:
             metrics = list(self.metrics.values())
             
         for metric in metrics:
-            metric.cleanup_old_values(retention)
+            metric.cleanup_old_values(retention, raw_retention)
@@ -1,9 +1,11 @@
+import numpy as np
 import psutil
 import os
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Optional, Any
+from typing import Deque, Dict, Optional, Any, Tuple
 from datetime import datetime
-from threading import Thread
+from threading import Lock, Thread
 import time
 
 
@@ -29,15 +31,78 @@ class ProcessMetrics:
     memory_percent: float
 
 
+_HISTORY_FIELDS = ("cpu_percent", "memory_percent", "memory_rss_mb", "disk_percent")
+
+
+class _WindowStats:
+    """Running sum and monotonic-deque min/max over the last ``size`` samples."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self.total = 0.0
+        self._window: Deque[float] = deque()
+        self._seen = 0
+        # (sample number, value) pairs; values increase in _mins and decrease in _maxs.
+        self._mins: Deque[Tuple[int, float]] = deque()
+        self._maxs: Deque[Tuple[int, float]] = deque()
+
+    def push(self, value: float):
+        if len(self._window) == self.size:
+            self.total -= self._window.popleft()
+            oldest = self._seen - self.size
+            if self._mins[0][0] == oldest:
+                self._mins.popleft()
+            if self._maxs[0][0] == oldest:
+                self._maxs.popleft()
+        self._window.append(value)
+        self.total += value
+        while self._mins and self._mins[-1][1] >= value:
+            self._mins.pop()
+        self._mins.append((self._seen, value))
+        while self._maxs and self._maxs[-1][1] <= value:
+            self._maxs.pop()
+        self._maxs.append((self._seen, value))
+        self._seen += 1
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "current": self._window[-1],
+            "min": self._mins[0][1],
+            "max": self._maxs[0][1],
+            "avg": self.total / len(self._window),
+        }
+
+
 class PerformanceMonitor:
-    def __init__(self, interval: float = 5.0):
+    def __init__(self, interval: float = 5.0, history_size: int = 1000):
         self.interval = interval
         self.is_running = False
         self.monitor_thread: Optional[Thread] = None
-        self.metrics_history: list[SystemMetrics] = []
+        # Fixed-size ring of recent samples; appending past capacity drops the oldest in O(1).
+        self.metrics_history: Deque[SystemMetrics] = deque(maxlen=history_size)
+        # Window aggregates over the same samples as metrics_history, updated per sample.
+        self._cpu_stats = _WindowStats(history_size)
+        self._memory_stats = _WindowStats(history_size)
+        # Serializes writers only. After each change they publish an immutable (history, summary)
+        # pair with a single reference assignment, so readers never lock.
+        self._history_lock = Lock()
+        self._published: Tuple[Dict[str, np.ndarray], Dict[str, Any]] = (self._empty_columns(0), {})
+        # Column ring mirroring metrics_history for get_metrics_history; _head is the next slot.
+        self._columns = self._empty_columns(history_size)
+        self._head = 0
         self.process_id = os.getpid()
         self.process = psutil.Process(self.process_id)
         self.last_net_io = None
+        # Constant for the life of the process; looked up once instead of per sample.
+        self._total_memory = psutil.virtual_memory().total
+        self._has_num_fds = hasattr(self.process, "num_fds")
+        # cpu_percent(interval=None) reports usage since its previous call without sleeping;
+        # prime both counters so the first real sample is meaningful.
+        psutil.cpu_percent(interval=None)
+        self.process.cpu_percent(interval=None)
 
     def start(self):
         if self.is_running:
@@ -54,16 +119,43 @@ class PerformanceMonitor:
     def _monitor_loop(self):
         while self.is_running:
             try:
-                metrics = self._collect_metrics()
-                self.metrics_history.append(metrics)
-                if len(self.metrics_history) > 1000:
-                    self.metrics_history.pop(0)
+                self._add_sample(self._collect_metrics())
             except Exception:
                 pass
             time.sleep(self.interval)
 
+    def _add_sample(self, metrics: SystemMetrics):
+        with self._history_lock:
+            self.metrics_history.append(metrics)
+            head = self._head
+            self._columns["timestamp"][head] = metrics.timestamp
+            for name in _HISTORY_FIELDS:
+                self._columns[name][head] = getattr(metrics, name)
+            self._head = (head + 1) % self.metrics_history.maxlen
+            self._cpu_stats.push(metrics.cpu_percent)
+            self._memory_stats.push(metrics.memory_percent)
+            self._publish()
+
+    @staticmethod
+    def _empty_columns(size: int) -> Dict[str, np.ndarray]:
+        columns = {name: np.zeros(size, dtype=np.float64) for name in _HISTORY_FIELDS}
+        columns["timestamp"] = np.zeros(size, dtype="datetime64[us]")
+        return columns
+
+    def _publish(self):
+        count = len(self.metrics_history)
+        summary = {
+            "sample_count": count,
+            "cpu": self._cpu_stats.summary(),
+            "memory": self._memory_stats.summary(),
+        } if count else {}
+        # Copy the ring out oldest-first; fancy indexing always yields fresh arrays.
+        order = np.arange(self._head - count, self._head) % self.metrics_history.maxlen
+        columns = {name: column[order] for name, column in self._columns.items()}
+        self._published = (columns, summary)
+
     def _collect_metrics(self) -> SystemMetrics:
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage("/")
 
@@ -92,21 +184,21 @@ class PerformanceMonitor:
 
     def get_process_metrics(self) -> ProcessMetrics:
         try:
-            cpu_percent = self.process.cpu_percent(interval=0.1)
+            cpu_percent = self.process.cpu_percent(interval=None)
             memory_info = self.process.memory_info()
             memory_mb = memory_info.rss / 1024 / 1024
 
             try:
                 memory_percent = self.process.memory_percent()
             except AttributeError:
-                memory_percent = (memory_info.rss / psutil.virtual_memory().total) * 100
+                memory_percent = (memory_info.rss / self._total_memory) * 100
 
             return ProcessMetrics(
                 pid=self.process_id,
                 cpu_percent=cpu_percent,
                 memory_mb=memory_mb,
                 num_threads=self.process.num_threads(),
-                num_fds=self.process.num_fds() if hasattr(self.process, "num_fds") else -1,
+                num_fds=self.process.num_fds() if self._has_num_fds else -1,
                 memory_percent=memory_percent,
             )
         except (psutil.NoSuchProcess, psutil.AccessDenied):
@@ -120,43 +212,27 @@ class PerformanceMonitor:
             )
 
     def get_metrics_summary(self) -> Dict[str, Any]:
-        if not self.metrics_history:
+        summary = self._published[1]
+        if not summary:
             return {}
-
-        cpu_values = [m.cpu_percent for m in self.metrics_history]
-        memory_values = [m.memory_percent for m in self.metrics_history]
-
         return {
-            "sample_count": len(self.metrics_history),
-            "cpu": {
-                "current": cpu_values[-1] if cpu_values else 0,
-                "min": min(cpu_values),
-                "max": max(cpu_values),
-                "avg": sum(cpu_values) / len(cpu_values),
-            },
-            "memory": {
-                "current": memory_values[-1] if memory_values else 0,
-                "min": min(memory_values),
-                "max": max(memory_values),
-                "avg": sum(memory_values) / len(memory_values),
-            },
+            **summary,
             "process": self.get_process_metrics().to_dict() if hasattr(ProcessMetrics, "to_dict") else {},
         }
 
     def get_metrics_history(self, limit: Optional[int] = None) -> list[Dict[str, Any]]:
-        history = self.metrics_history
+        columns = self._published[0]
         if limit:
-            history = history[-limit:]
-        return [
-            {
-                "timestamp": m.timestamp.isoformat(),
-                "cpu_percent": m.cpu_percent,
-                "memory_percent": m.memory_percent,
-                "memory_rss_mb": m.memory_rss_mb,
-                "disk_percent": m.disk_percent,
-            }
-            for m in history
-        ]
+            columns = {name: column[-limit:] for name, column in columns.items()}
+        # Format every timestamp in one C loop, then zip plain Python columns into rows.
+        stamps = np.datetime_as_string(columns["timestamp"], unit="us").tolist()
+        rows = zip(stamps, *(columns[name].tolist() for name in _HISTORY_FIELDS))
+        return [dict(zip(("timestamp", *_HISTORY_FIELDS), row)) for row in rows]
 
     def clear_history(self):
-        self.metrics_history.clear()
+        with self._history_lock:
+            self.metrics_history.clear()
+            self._cpu_stats.clear()
+            self._memory_stats.clear()
+            self._head = 0
+            self._publish()
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 from typing import Dict, Any
 import threading
 
+from sqlalchemy import text
+
 # --- Core Imports ---
 from telemetry.collector import TelemetryCollector
 from telemetry.exporters import MetricsExporter
@@ -347,6 +349,12 @@ def test_telemetry_concurrency():
     print(f"Concurrency Test: Metric count = {len(metric.values)}")
     assert len(metric.values) == 500
 
+def test_sqlite_connections_use_wal(db_manager):
+    """SQLite connections are tuned for concurrent reads and cheap commits"""
+    with db_manager.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+
 if __name__ == "__main__":
     # Allow running without pytest
     try:
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Make the platform packages (sessions, telemetry, ...) importable once for every test module.
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
@@ -0,0 +1,85 @@
+import json
+
+from telemetry.collector import MAX_EVENT_EXPORT_ATTEMPTS, TelemetryCollector
+from telemetry.events import Event, EventType
+from telemetry.exporters import JSONExporter, MetricsExporter
+
+
+class _NoneReturningExporter(MetricsExporter):
+    def __init__(self):
+        self.batches = []
+
+    def export(self, metrics):
+        return True
+
+    def export_events(self, events):
+        self.batches.append([event.seq for event in events])
+
+
+def test_export_all_sends_each_event_once(tmp_path):
+    collector = TelemetryCollector()
+    collector.add_exporter(JSONExporter(str(tmp_path)))
+    collector.emit_event(Event(event_type=EventType.AGENT_START, source="test"))
+    collector.emit_event(Event(event_type=EventType.AGENT_END, source="test"))
+    assert collector.export_all()
+    collector.emit_event(Event(event_type=EventType.AGENT_ERROR, source="test"))
+    assert collector.export_all()
+    collector.stop()
+
+    lines = (tmp_path / "events.jsonl").read_text().splitlines()
+    assert [json.loads(line)["event_type"] for line in lines] == ["agent.start", "agent.end", "agent.error"]
+
+
+def test_export_events_returning_none_counts_as_failure():
+    collector = TelemetryCollector()
+    exporter = _NoneReturningExporter()
+    collector.add_exporter(exporter)
+    collector.emit_event(Event(event_type=EventType.AGENT_START, source="test"))
+
+    assert not collector.export_all()
+    assert not collector.export_all()
+    collector.stop()
+
+    # The cursor never advanced, so the same event was offered both times.
+    assert len(exporter.batches) == 2
+    assert exporter.batches[0] == exporter.batches[1]
+
+
+def test_unexportable_batch_is_dropped_after_bounded_retries(tmp_path):
+    collector = TelemetryCollector()
+    collector.add_exporter(JSONExporter(str(tmp_path)))
+    collector.emit_event(Event(event_type=EventType.AGENT_START, source="test", data={"obj": object()}))
+
+    for _ in range(MAX_EVENT_EXPORT_ATTEMPTS):
+        assert not collector.export_all()
+    collector.emit_event(Event(event_type=EventType.AGENT_END, source="test"))
+    assert collector.export_all()
+    collector.stop()
+
+    lines = (tmp_path / "events.jsonl").read_text().splitlines()
+    assert [json.loads(line)["event_type"] for line in lines] == ["agent.end"]
+
+
+def test_json_exporter_writes_a_failed_batch_not_at_all(tmp_path):
+    exporter = JSONExporter(str(tmp_path))
+    good = Event(event_type=EventType.AGENT_START, source="test", data={1: "int key"})
+    bad = Event(event_type=EventType.AGENT_END, source="test", data={"obj": object()})
+
+    assert not exporter.export_events([good, bad])
+    assert exporter.export_events([good])
+    exporter.close()
+
+    lines = (tmp_path / "events.jsonl").read_text().splitlines()
+    assert [json.loads(line)["data"] for line in lines] == [{"1": "int key"}]
+
+
+def test_health_reports_running_state_despite_cache():
+    collector = TelemetryCollector(export_interval=0.01, summary_ttl_s=60)
+    collector.performance_monitor.interval = 0.01
+    assert collector.get_health_status()["is_running"] is False
+    collector.start()
+    try:
+        assert collector.get_health_status()["is_running"] is True
+    finally:
+        collector.stop()
+    assert collector.get_health_status()["is_running"] is False
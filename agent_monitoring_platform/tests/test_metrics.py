@@ -0,0 +1,70 @@
+import math
+
+from telemetry.metrics import Counter, DecayingAggregator, Histogram, MetricDefinition, MetricType, Summary
+
+
+def test_decaying_aggregator_keeps_logarithmic_buckets():
+    aggregator = DecayingAggregator(resolution_s=60)
+    minutes = 90 * 24 * 60
+    for minute in range(minutes):
+        aggregator.add(float(minute % 10), ts=minute * 60.0)
+
+    assert len(aggregator.buckets) <= 40
+    assert aggregator.summarize()["count"] == minutes
+    assert aggregator.summarize()["max"] == 9.0
+    # Queries are bucket-granular, but recent buckets stay small.
+    assert 5 <= aggregator.summarize(since=(minutes - 5) * 60.0)["count"] <= 10
+
+    aggregator.drop_before((minutes - 60) * 60.0)
+    assert 60 <= aggregator.summarize()["count"] <= 120
+
+
+def test_samples_keep_double_precision():
+    histogram = Histogram(MetricDefinition("latency", MetricType.HISTOGRAM, "test"))
+    for value in (0.1, 1.0, 20000001.0):
+        histogram.record(value)
+
+    assert histogram.get_values()[0].value == 0.1
+    stats = histogram.get_statistics()
+    assert stats["p99"] <= stats["max"] == 20000001.0
+
+    counter = Counter(MetricDefinition("tokens", MetricType.COUNTER, "test"))
+    counter.increment(2**24 + 1)
+    assert counter.values[-1].value == 2**24 + 1
+
+
+def test_uniform_histogram_accepts_non_finite_values():
+    histogram = Histogram(MetricDefinition("latency", MetricType.HISTOGRAM, "test"), buckets=[1, 2, 3, 4])
+    histogram.record(2.5)
+    histogram.record(float("inf"))
+    histogram.record(float("nan"))
+
+    assert histogram.count == 3
+    assert histogram._bucket_counts == [0, 0, 1, 0, 2]
+    assert histogram.get_buckets()[-1] == (float("inf"), 3)
+
+
+def test_histogram_routes_nan_the_same_in_record_and_record_many():
+    values = [0.5, 2.5, float("nan"), float("-inf"), float("inf")]
+    for buckets in ([1, 2, 3, 4], [1, 2, 5, 10]):
+        single = Histogram(MetricDefinition("single", MetricType.HISTOGRAM, "test"), buckets=buckets)
+        for value in values:
+            single.record(value)
+        batch = Histogram(MetricDefinition("batch", MetricType.HISTOGRAM, "test"), buckets=buckets)
+        batch.record_many(values)
+
+        assert single._bucket_counts == batch._bucket_counts
+        assert single._bucket_counts[-1] == 2
+
+
+def test_stddev_is_stable_for_values_far_from_zero():
+    expected = math.sqrt(2 / 3)
+    summary = Summary(MetricDefinition("offset", MetricType.SUMMARY, "test"))
+    for value in (1e9 + 1, 1e9 + 2, 1e9 + 3):
+        summary.record(value)
+    assert math.isclose(summary.get_summary()["stddev"], expected, rel_tol=1e-6)
+
+    histogram = Histogram(MetricDefinition("offset_hist", MetricType.HISTOGRAM, "test"))
+    histogram.record(1e9 + 1)
+    histogram.record_many([1e9 + 2, 1e9 + 3])
+    assert math.isclose(histogram.get_statistics()["stddev"], expected, rel_tol=1e-6)
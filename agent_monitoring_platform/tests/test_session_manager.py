@@ -1,16 +1,26 @@
-import os
+import json
+import subprocess
 import sys
 import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-
 from sessions import SessionManager
 from telemetry.collector import TelemetryCollector
+from examples import langchain_bridge
 from examples.langchain_bridge import AgentMonitoringCallback
 
 
+@pytest.fixture
+def session_manager(tmp_path):
+    manager = SessionManager(storage_dir=str(tmp_path / "sessions"))
+    yield manager
+    manager.close()
+
+
 class _LLMResultStub:
     def __init__(self, llm_output):
         self.llm_output = llm_output
@@ -30,7 +40,7 @@ def test_session_manager_persists_runs(tmp_path):
     )
     manager.close_session(session.session_id)
 
-    reloaded = SessionManager(storage_dir=str(storage))
+    reloaded = SessionManager(storage_dir=str(storage), max_runs_per_session=5000)
     loaded_session = reloaded.get_session(session.session_id)
 
     assert loaded_session is not None
@@ -38,9 +48,8 @@ def test_session_manager_persists_runs(tmp_path):
     assert loaded_session.runs[0].metrics["duration_ms"] == pytest.approx(123.4)
 
 
-def test_cross_session_summary(tmp_path):
-    storage = tmp_path / "sessions"
-    manager = SessionManager(storage_dir=str(storage))
+def test_cross_session_summary(session_manager):
+    manager = session_manager
 
     session_a = manager.start_session(agent_id="agent-2", name="Session A")
     session_b = manager.start_session(agent_id="agent-2", name="Session B")
@@ -58,11 +67,77 @@ def test_cross_session_summary(tmp_path):
     assert summary["total_runs"] == 2
     assert summary["success_rate"] == pytest.approx(50.0)
     assert summary["avg_duration_ms"] == pytest.approx(62.5)
+    assert summary["max_duration_ms"] == pytest.approx(75.0)
 
 
-def test_callback_records_session_runs(tmp_path):
+def test_record_runs_applies_batch_or_nothing(tmp_path):
     storage = tmp_path / "sessions"
     manager = SessionManager(storage_dir=str(storage))
+    session_a = manager.start_session(agent_id="agent-batch")
+    session_b = manager.start_session(agent_id="agent-batch")
+
+    runs = manager.record_runs(
+        [
+            {"session_id": session_a.session_id, "metrics": {"duration_ms": 10}},
+            {"session_id": session_b.session_id, "metrics": {"duration_ms": 20}, "status": "failed"},
+            {"session_id": session_a.session_id, "metrics": {"duration_ms": 30}},
+        ]
+    )
+    assert [run.session_id for run in runs] == [session_a.session_id, session_b.session_id, session_a.session_id]
+
+    with pytest.raises(ValueError):
+        manager.record_runs([{"session_id": session_a.session_id}, {"session_id": "missing"}])
+    with pytest.raises(TypeError):
+        manager.record_runs(
+            [
+                {"session_id": session_a.session_id},
+                {"session_id": session_a.session_id, "unexpected": 1},
+                {"session_id": session_b.session_id},
+            ]
+        )
+    manager.close()
+
+    reloaded = SessionManager(storage_dir=str(storage), max_runs_per_session=5000)
+    assert [run.metrics["duration_ms"] for run in reloaded.get_session(session_a.session_id).runs] == [10, 30]
+    assert reloaded.get_cross_session_summary(agent_id="agent-batch")["total_runs"] == 3
+
+
+def test_unencodable_run_is_rejected_by_the_caller(tmp_path):
+    storage = tmp_path / "sessions"
+    manager = SessionManager(storage_dir=str(storage), max_runs_per_session=2)
+    session = manager.start_session(agent_id="agent-encode")
+
+    manager.record_run(session_id=session.session_id, metrics={"duration_ms": 1, 7: "int key"})
+    with pytest.raises(TypeError):
+        manager.record_run(session_id=session.session_id, metrics={"bad": object()})
+    with pytest.raises(TypeError):
+        manager.record_runs(
+            [
+                {"session_id": session.session_id, "metrics": {"duration_ms": 2}},
+                {"session_id": session.session_id, "tags": {"bad": {1, 2}}},
+            ]
+        )
+    with pytest.raises(TypeError):
+        manager.start_session(agent_id="agent-encode", tags={"bad": object()})
+    for i in range(2, 5):
+        manager.record_run(session_id=session.session_id, metrics={"duration_ms": i})
+    manager.close()
+
+    assert len(session.runs) == 2
+    reloaded = SessionManager(storage_dir=str(storage), max_runs_per_session=2)
+    try:
+        assert len(reloaded) == 1
+        loaded = reloaded.get_session(session.session_id)
+        assert [run.metrics["duration_ms"] for run in loaded.runs] == [3, 4]
+        assert loaded.archived_runs == 2
+    finally:
+        reloaded.close()
+    archive_lines = (storage / "archive" / f"{session.session_id}.jsonl").read_text().splitlines()
+    assert json.loads(archive_lines[0])["metrics"] == {"duration_ms": 1, "7": "int key"}
+
+
+def test_callback_records_session_runs(session_manager):
+    manager = session_manager
     session = manager.start_session(agent_id="agent-cb", name="Callback Session")
 
     collector = TelemetryCollector()
@@ -99,3 +174,188 @@ def test_callback_records_session_runs(tmp_path):
     assert recorded_run.model == "grok-beta"
     assert recorded_run.metrics["llm_calls"] == 1
     assert recorded_run.metrics["tokens_used"] == 10
+
+
+def test_long_running_agent_survives_run_ttl(session_manager, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(langchain_bridge, "time", SimpleNamespace(time=lambda: clock[0]))
+    session = session_manager.start_session(agent_id="agent-slow")
+    callback = AgentMonitoringCallback(
+        TelemetryCollector(),
+        agent_name="agent-slow",
+        session_manager=session_manager,
+        session_id=session.session_id,
+        run_ttl_s=300.0,
+    )
+
+    agent_run_id = uuid.uuid4()
+    callback.on_chain_start({}, {"input": "slow"}, run_id=agent_run_id, parent_run_id=None)
+    orphan_tool_id = uuid.uuid4()
+    callback.on_tool_start({"name": "lost"}, "x", run_id=orphan_tool_id, parent_run_id=agent_run_id)
+
+    clock[0] += 301.0
+    callback.on_tool_start({"name": "search"}, "y", run_id=uuid.uuid4(), parent_run_id=agent_run_id)
+    assert orphan_tool_id not in callback.runs
+    assert agent_run_id in callback.runs
+
+    callback.on_chain_end({"output": "done"}, run_id=agent_run_id, parent_run_id=None)
+    runs = session_manager.get_session(session.session_id).runs
+    assert len(runs) == 1
+    assert runs[0].metrics["duration_ms"] == pytest.approx(301000.0)
+
+
+def test_session_log_appends_deltas_and_compacts(tmp_path):
+    storage = tmp_path / "sessions"
+    manager = SessionManager(storage_dir=str(storage))
+
+    session = manager.start_session(agent_id="agent-log", name="Log Session")
+    for idx in range(3):
+        manager.record_run(session_id=session.session_id, metrics={"duration_ms": idx})
+    manager.close_session(session.session_id, status="failed")
+
+    lines = manager.storage_file.read_text().splitlines()
+    assert len(lines) == 5
+    assert [json.loads(line)["op"] for line in lines] == [
+        "start_session",
+        "add_run",
+        "add_run",
+        "add_run",
+        "close_session",
+    ]
+
+    manager.compact()
+    lines = manager.storage_file.read_text().splitlines()
+    assert len(lines) == 1
+    assert "op" not in json.loads(lines[0])
+
+    manager.record_run(session_id=session.session_id, metrics={"duration_ms": 3})
+    manager.flush()
+    reloaded = SessionManager(storage_dir=str(storage), max_runs_per_session=5000)
+    loaded_session = reloaded.get_session(session.session_id)
+    assert loaded_session.status == "failed"
+    assert [run.metrics["duration_ms"] for run in loaded_session.runs] == [0, 1, 2, 3]
+
+
+def test_recent_runs_are_newest_first(session_manager):
+    manager = session_manager
+    session_a = manager.start_session(agent_id="agent-a")
+    session_b = manager.start_session(agent_id="agent-b")
+
+    base = datetime(2025, 1, 1)
+    manager.record_run(session_id=session_a.session_id, completed_at=base + timedelta(seconds=2))
+    manager.record_run(session_id=session_b.session_id, completed_at=base + timedelta(seconds=3))
+    manager.record_run(session_id=session_a.session_id, completed_at=base + timedelta(seconds=1))
+
+    recent = manager.get_recent_runs(limit=2)
+    assert [run.completed_at.second for _, run in recent] == [3, 2]
+
+    agent_runs = manager.get_recent_runs(agent_id="agent-a")
+    assert [run.completed_at.second for _, run in agent_runs] == [2, 1]
+    assert manager.get_cross_session_summary(agent_id="agent-a")["last_run_at"] == (
+        base + timedelta(seconds=2)
+    ).isoformat()
+
+
+def test_runs_over_cap_are_archived(tmp_path):
+    storage = tmp_path / "sessions"
+    manager = SessionManager(storage_dir=str(storage), max_runs_per_session=2)
+    session = manager.start_session(agent_id="agent-cap")
+    for i in range(5):
+        manager.record_run(session_id=session.session_id, metrics={"duration_ms": i})
+    manager.flush()
+
+    assert [run.metrics["duration_ms"] for run in session.runs] == [3, 4]
+    assert session.archived_runs == 3
+    archive_lines = (manager.archive_dir / f"{session.session_id}.jsonl").read_text().splitlines()
+    assert [json.loads(line)["metrics"]["duration_ms"] for line in archive_lines] == [0, 1, 2]
+    summary = manager.get_cross_session_summary()
+    assert summary["total_runs"] == 5
+    assert summary["avg_duration_ms"] == 3.5
+
+    manager.compact()
+    reloaded = SessionManager(storage_dir=str(storage), max_runs_per_session=2)
+    loaded_session = reloaded.get_session(session.session_id)
+    assert len(loaded_session.runs) == 2
+    assert loaded_session.success_runs() == 5
+    assert reloaded.get_cross_session_summary()["total_runs"] == 5
+
+
+
+def test_cross_session_summary_survives_restart(tmp_path):
+    storage = tmp_path / "sessions"
+    manager = SessionManager(storage_dir=str(storage), max_runs_per_session=3)
+    for agent_id in ("agent-a", "agent-b"):
+        session = manager.start_session(agent_id=agent_id)
+        for i in range(7):
+            manager.record_run(session_id=session.session_id, metrics={"duration_ms": 100 * i})
+    before = manager.get_cross_session_summary()
+    before_agent = manager.get_cross_session_summary(agent_id="agent-a")
+    manager.close()
+
+    reloaded = SessionManager(storage_dir=str(storage), max_runs_per_session=3)
+    try:
+        assert reloaded.get_cross_session_summary() == before
+        assert reloaded.get_cross_session_summary(agent_id="agent-a") == before_agent
+    finally:
+        reloaded.close()
+    assert before["total_runs"] == 14
+    assert before["max_duration_ms"] == 600
+    assert before["avg_duration_ms"] == 500
+
+
+def test_queued_writes_survive_interpreter_exit(tmp_path):
+    storage = tmp_path / "sessions"
+    script = (
+        "import sys\n"
+        "from sessions import SessionManager\n"
+        "manager = SessionManager(storage_dir=sys.argv[1], max_runs_per_session=100)\n"
+        "session = manager.start_session(agent_id='agent-exit')\n"
+        "for i in range(2000):\n"
+        "    manager.record_run(session_id=session.session_id, metrics={'i': i})\n"
+        "print(session.session_id)\n"
+    )
+    package_root = Path(__file__).resolve().parents[1]
+    result = subprocess.run(
+        [sys.executable, "-c", script, str(storage)],
+        cwd=package_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    reloaded = SessionManager(storage_dir=str(storage), max_runs_per_session=100)
+    try:
+        session = reloaded.get_session(result.stdout.strip())
+        assert session.archived_runs == 1900
+        assert [run.metrics["i"] for run in session.runs] == list(range(1900, 2000))
+    finally:
+        reloaded.close()
+
+
+def test_bad_log_line_is_skipped_on_load(tmp_path):
+    storage = tmp_path / "sessions"
+    manager = SessionManager(storage_dir=str(storage))
+    session = manager.start_session(agent_id="agent-load")
+    manager.record_run(session_id=session.session_id, metrics={"duration_ms": 5})
+    manager.close()
+    with (storage / "sessions.jsonl").open("ab") as handle:
+        handle.write(b'{"session_id": "broken", "runs": 5}\n{"op": "add_run"\n')
+
+    reloaded = SessionManager(storage_dir=str(storage))
+    try:
+        assert [s.session_id for s in reloaded.list_sessions()] == [session.session_id]
+        assert reloaded.get_cross_session_summary()["total_runs"] == 1
+    finally:
+        reloaded.close()
+
+
+def test_close_does_not_raise_after_failed_load(tmp_path, monkeypatch):
+    def fail(self):
+        raise OSError("disk gone")
+
+    monkeypatch.setattr(SessionManager, "_load_sessions", fail)
+    manager = SessionManager(storage_dir=str(tmp_path / "sessions"))
+    with pytest.raises(RuntimeError):
+        manager.list_sessions()
+    manager.flush()
+    manager.close()
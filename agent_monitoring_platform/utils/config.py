@@ -1,41 +1,75 @@
 import os
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 
-class Config:
-    """Configuration management for the monitoring platform"""
+def _env_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+class _LazyConfig(type):
+    """Read and coerce a Config setting from the environment on first access"""
+
+    def __getattr__(cls, name):
+        try:
+            env_var, default, coerce = cls._ENV_SETTINGS[name]
+        except KeyError:
+            raise AttributeError(f"type object 'Config' has no attribute '{name}'") from None
 
-    # Database
-    DB_URL: str = os.getenv("MONITORING_DB_URL", "sqlite:///monitoring.db")
-    DB_POOL_SIZE: int = int(os.getenv("MONITORING_DB_POOL_SIZE", "10"))
-    DB_MAX_OVERFLOW: int = int(os.getenv("MONITORING_DB_MAX_OVERFLOW", "20"))
-    DB_SSL: bool = os.getenv("MONITORING_DB_SSL", "false").lower() == "true"
+        raw = os.getenv(env_var, default)
+        value = None if raw is None else coerce(raw)
+        setattr(cls, name, value)
+        return value
 
-    # Telemetry
-    LOG_LEVEL: str = os.getenv("MONITORING_LOG_LEVEL", "INFO")
-    EXPORT_INTERVAL: int = int(os.getenv("MONITORING_EXPORT_INTERVAL", "60"))
-    RETENTION_DAYS: int = int(os.getenv("MONITORING_RETENTION_DAYS", "90"))
-    METRICS_BATCH_SIZE: int = int(os.getenv("MONITORING_METRICS_BATCH_SIZE", "1000"))
 
-    # Alerting
-    SLACK_WEBHOOK_URL: Optional[str] = os.getenv("SLACK_WEBHOOK_URL")
-    ALERT_THRESHOLD_SEVERITY: str = os.getenv("ALERT_THRESHOLD_SEVERITY", "error")
-    ALERT_DEDUPLICATE_WINDOW: int = int(os.getenv("ALERT_DEDUPLICATE_WINDOW", "300"))
-    ALERT_RATE_LIMIT: int = int(os.getenv("ALERT_RATE_LIMIT", "100"))
+class Config(metaclass=_LazyConfig):
+    """Configuration management for the monitoring platform"""
 
-    # Dashboard
-    DASHBOARD_HOST: str = os.getenv("DASHBOARD_HOST", "127.0.0.1")
-    DASHBOARD_PORT: int = int(os.getenv("DASHBOARD_PORT", "8501"))
-    DASHBOARD_THEME: str = os.getenv("DASHBOARD_THEME", "light")
+    # Setting name -> (environment variable, default, coercion). Values are
+    # resolved lazily and then cached as plain class attributes.
+    _ENV_SETTINGS = {
+        # Database
+        "DB_URL": ("MONITORING_DB_URL", "sqlite:///monitoring.db", str),
+        "DB_POOL_SIZE": ("MONITORING_DB_POOL_SIZE", "10", int),
+        "DB_MAX_OVERFLOW": ("MONITORING_DB_MAX_OVERFLOW", "20", int),
+        "DB_SSL": ("MONITORING_DB_SSL", "false", _env_bool),
+        # Telemetry
+        "LOG_LEVEL": ("MONITORING_LOG_LEVEL", "INFO", str),
+        "EXPORT_INTERVAL": ("MONITORING_EXPORT_INTERVAL", "60", int),
+        "RETENTION_DAYS": ("MONITORING_RETENTION_DAYS", "90", int),
+        "METRICS_BATCH_SIZE": ("MONITORING_METRICS_BATCH_SIZE", "1000", int),
+        "MAX_COMPLETED_SPANS": ("MONITORING_MAX_COMPLETED_SPANS", "10000", int),
+        "MAX_RUNS_PER_SESSION": ("MONITORING_MAX_RUNS_PER_SESSION", "1000", int),
+        "MAX_EVENT_HISTORY": ("MONITORING_MAX_EVENT_HISTORY", "4096", int),
+        "RAW_METRIC_RETENTION_MINUTES": ("MONITORING_RAW_METRIC_RETENTION_MINUTES", "1440", int),
+        # Alerting
+        "SLACK_WEBHOOK_URL": ("SLACK_WEBHOOK_URL", None, str),
+        "ALERT_THRESHOLD_SEVERITY": ("ALERT_THRESHOLD_SEVERITY", "error", str),
+        "ALERT_DEDUPLICATE_WINDOW": ("ALERT_DEDUPLICATE_WINDOW", "300", int),
+        "ALERT_RATE_LIMIT": ("ALERT_RATE_LIMIT", "100", int),
+        # Dashboard
+        "DASHBOARD_HOST": ("DASHBOARD_HOST", "127.0.0.1", str),
+        "DASHBOARD_PORT": ("DASHBOARD_PORT", "8501", int),
+        "DASHBOARD_THEME": ("DASHBOARD_THEME", "light", str),
+        # Analytics
+        "ANOMALY_DETECTION_THRESHOLD": ("ANOMALY_DETECTION_THRESHOLD", "2.0", float),
+        "REGRESSION_SIGNIFICANCE_LEVEL": ("REGRESSION_SIGNIFICANCE_LEVEL", "0.05", float),
+        "REGRESSION_PERCENT_THRESHOLD": ("REGRESSION_PERCENT_THRESHOLD", "5.0", float),
+        # Performance
+        "MAX_WORKERS": ("MONITORING_MAX_WORKERS", "4", int),
+        "CACHE_TTL": ("MONITORING_CACHE_TTL", "300", int),
+    }
 
-    # Analytics
-    ANOMALY_DETECTION_THRESHOLD: float = float(os.getenv("ANOMALY_DETECTION_THRESHOLD", "2.0"))
-    REGRESSION_SIGNIFICANCE_LEVEL: float = float(os.getenv("REGRESSION_SIGNIFICANCE_LEVEL", "0.05"))
-    REGRESSION_PERCENT_THRESHOLD: float = float(os.getenv("REGRESSION_PERCENT_THRESHOLD", "5.0"))
+    # Read-only view built by the first get_all_settings() call.
+    _SNAPSHOT: Optional[Mapping[str, Mapping[str, Any]]] = None
 
-    # Performance
-    MAX_WORKERS: int = int(os.getenv("MONITORING_MAX_WORKERS", "4"))
-    CACHE_TTL: int = int(os.getenv("MONITORING_CACHE_TTL", "300"))
+    @classmethod
+    def reload(cls):
+        """Forget resolved settings so the next access re-reads the environment"""
+        for name in cls._ENV_SETTINGS:
+            if name in cls.__dict__:
+                delattr(cls, name)
+        cls._SNAPSHOT = None
 
     @classmethod
     def get_db_url(cls) -> str:
@@ -46,7 +80,16 @@ class Config:
         return os.getenv("ENVIRONMENT", "development") == "production"
 
     @classmethod
-    def get_all_settings(cls) -> dict:
+    def get_all_settings(cls) -> Mapping[str, Mapping[str, Any]]:
+        """Settings grouped by area, as a cached read-only mapping"""
+        if cls._SNAPSHOT is None:
+            cls._SNAPSHOT = MappingProxyType(
+                {section: MappingProxyType(values) for section, values in cls._build_settings().items()}
+            )
+        return cls._SNAPSHOT
+
+    @classmethod
+    def _build_settings(cls) -> dict:
         return {
             "database": {
                 "url": cls.DB_URL,
@@ -59,6 +102,10 @@ class Config:
                 "export_interval": cls.EXPORT_INTERVAL,
                 "retention_days": cls.RETENTION_DAYS,
                 "metrics_batch_size": cls.METRICS_BATCH_SIZE,
+                "max_completed_spans": cls.MAX_COMPLETED_SPANS,
+                "max_runs_per_session": cls.MAX_RUNS_PER_SESSION,
+                "max_event_history": cls.MAX_EVENT_HISTORY,
+                "raw_metric_retention_minutes": cls.RAW_METRIC_RETENTION_MINUTES,
             },
             "alerting": {
                 "slack_webhook_url": bool(cls.SLACK_WEBHOOK_URL),
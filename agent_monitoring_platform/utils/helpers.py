@@ -1,22 +1,70 @@
+import bisect
+import itertools
+import os
+import re
+import secrets
+import sys
+import time
 import uuid
 from datetime import timedelta
 
+import numpy as np
+
+# Splat into @dataclass(...) to get __slots__ where supported (Python 3.10+).
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Random per-process prefix plus a counter: unique without a urandom call per ID.
+_FAST_ID_PREFIX = secrets.token_hex(8)
+_FAST_ID_COUNTER = itertools.count(1)
+
+# Compiled once at import; mask_sensitive_data runs on every masked log line.
+_MASK_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), replacement)
+    for pattern, replacement in (
+        (r"api[_-]?key[:\s]*['\"]?([a-zA-Z0-9_\-]+)['\"]?", "api_key: ***"),
+        (r"password[:\s]*['\"]?([^\s'\"]+)['\"]?", "password: ***"),
+        (r"token[:\s]*['\"]?([a-zA-Z0-9_\-]+)['\"]?", "token: ***"),
+    )
+]
+_CARD_NUMBER = re.compile(r"\b[0-9]{16}\b")
+# ASCII word boundaries scan about twice as fast and match a superset of
+# _CARD_NUMBER, so a miss here means there is no card number to mask.
+_CARD_NUMBER_CANDIDATE = re.compile(r"\b[0-9]{16}\b", re.ASCII)
+
+# format_duration picks its unit by bisecting the thresholds; each threshold
+# belongs to the larger unit (999.9 -> ms, 1000 -> s).
+_DURATION_THRESHOLDS = (1000.0, 60000.0)
+_DURATION_UNITS = (("ms", 1.0), ("s", 1000.0), ("m", 60000.0))
+
+# parse_duration suffix -> milliseconds multiplier; "ms" is checked first.
+_DURATION_SUFFIXES = {"ms": 1.0, "s": 1000.0, "m": 60000.0, "h": 3600000.0}
+
 
 def generate_id(prefix: str = "") -> str:
     """Generate a unique ID"""
-    id_str = str(uuid.uuid4()).replace("-", "")[:12]
+    id_str = os.urandom(6).hex()
     return f"{prefix}_{id_str}" if prefix else id_str
 
 
+def fast_id() -> str:
+    """Generate a cheap unique ID for high-volume records such as spans and runs"""
+    return f"{_FAST_ID_PREFIX}{next(_FAST_ID_COUNTER):016x}"
+
+
+def sortable_id() -> str:
+    """Generate a UUIDv7-style ID whose millisecond timestamp prefix keeps IDs in creation order"""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    # Stamp the version (7) and RFC 4122 variant bits over the random part.
+    value = (value & ~(0xF << 76) & ~(0x3 << 62)) | (0x7 << 76) | (0x2 << 62)
+    return str(uuid.UUID(int=value))
+
+
 def format_duration(milliseconds: float) -> str:
     """Format milliseconds to human-readable duration"""
 
-    if milliseconds < 1000:
-        return f"{milliseconds:.2f}ms"
-    elif milliseconds < 60000:
-        return f"{milliseconds / 1000:.2f}s"
-    else:
-        return f"{milliseconds / 60000:.2f}m"
+    index = bisect.bisect_right(_DURATION_THRESHOLDS, milliseconds)
+    suffix, divisor = _DURATION_UNITS[index]
+    return f"{milliseconds / divisor:.2f}{suffix}"
 
 
 def parse_duration(duration_str: str) -> float:
@@ -24,16 +72,12 @@ def parse_duration(duration_str: str) -> float:
 
     duration_str = duration_str.strip().lower()
 
-    if duration_str.endswith("ms"):
-        return float(duration_str[:-2])
-    elif duration_str.endswith("s"):
-        return float(duration_str[:-1]) * 1000
-    elif duration_str.endswith("m"):
-        return float(duration_str[:-1]) * 60000
-    elif duration_str.endswith("h"):
-        return float(duration_str[:-1]) * 3600000
-    else:
-        return float(duration_str)
+    for size in (2, 1):
+        multiplier = _DURATION_SUFFIXES.get(duration_str[-size:])
+        if multiplier is not None:
+            return float(duration_str[:-size]) * multiplier
+
+    return float(duration_str)
 
 
 def calculate_percentage_change(old_value: float, new_value: float) -> float:
@@ -45,6 +89,18 @@ def calculate_percentage_change(old_value: float, new_value: float) -> float:
     return ((new_value - old_value) / abs(old_value)) * 100
 
 
+def calculate_percentage_change_batch(old_values, new_values) -> np.ndarray:
+    """Elementwise calculate_percentage_change over paired arrays of values"""
+
+    old = np.asarray(old_values, dtype=np.float64)
+    new = np.asarray(new_values, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (new - old) / np.abs(old) * 100
+
+    return np.where(old == 0, np.where(new == 0, 0.0, 100.0), change)
+
+
 def truncate_string(s: str, max_length: int = 100) -> str:
     """Truncate string to max length"""
 
@@ -56,16 +112,10 @@ def truncate_string(s: str, max_length: int = 100) -> str:
 def mask_sensitive_data(data: str) -> str:
     """Mask sensitive information in data"""
 
-    import re
-
-    patterns = [
-        (r"api[_-]?key[:\s]*['\"]?([a-zA-Z0-9_\-]+)['\"]?", "api_key: ***"),
-        (r"password[:\s]*['\"]?([^\s'\"]+)['\"]?", "password: ***"),
-        (r"token[:\s]*['\"]?([a-zA-Z0-9_\-]+)['\"]?", "token: ***"),
-        (r"\b[0-9]{16}\b", "****-****-****-****"),
-    ]
+    for pattern, replacement in _MASK_PATTERNS:
+        data = pattern.sub(replacement, data)
 
-    for pattern, replacement in patterns:
-        data = re.sub(pattern, replacement, data, flags=re.IGNORECASE)
+    if _CARD_NUMBER_CANDIDATE.search(data) is not None:
+        data = _CARD_NUMBER.sub("****-****-****-****", data)
 
     return data
@@ -1,9 +1,12 @@
 import logging
 import sys
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from .config import Config
 
+# Logger name -> (level, logger) as last configured by setup_logging.
+_CONFIGURED: Dict[str, Tuple[str, logging.Logger]] = {}
+
 
 def setup_logging(name: Optional[str] = None, level: Optional[str] = None) -> logging.Logger:
     """Setup logging with standard format"""
@@ -11,6 +14,17 @@ def setup_logging(name: Optional[str] = None, level: Optional[str] = None) -> lo
     level = level or Config.LOG_LEVEL
     logger_name = name or "monitoring_platform"
 
+    configured = _CONFIGURED.get(logger_name)
+    if configured is not None and configured[0] == level:
+        return configured[1]
+
+    # The platform format never prints thread or process fields, so skip
+    # collecting them on every LogRecord. Pass arguments %-style
+    # (logger.debug("x=%s", x)) so disabled levels skip formatting entirely.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     logger = logging.getLogger(logger_name)
     logger.setLevel(getattr(logging, level, logging.INFO))
 
@@ -23,6 +37,7 @@ def setup_logging(name: Optional[str] = None, level: Optional[str] = None) -> lo
         handler.setFormatter(formatter)
         logger.addHandler(handler)
 
+    _CONFIGURED[logger_name] = (level, logger)
     return logger
 
 
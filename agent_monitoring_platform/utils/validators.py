@@ -1,5 +1,12 @@
 from typing import Any, Dict, List, Optional, Tuple
 
+_VALID_SEVERITIES = ["info", "warning", "error", "critical"]
+
+# Exact int/float is the common case and a set hit is cheaper than isinstance
+# over a tuple; subclasses (bool, numpy scalars) still fall back to isinstance.
+_NUMBER_TYPES = (int, float)
+_EXACT_NUMBER_TYPES = frozenset(_NUMBER_TYPES)
+
 
 def validate_metric(metric_name: str, value: float, tags: Optional[Dict[str, str]] = None) -> Tuple[bool, Optional[str]]:
     """Validate a metric"""
@@ -10,7 +17,7 @@ def validate_metric(metric_name: str, value: float, tags: Optional[Dict[str, str
     if not isinstance(metric_name, str):
         return False, "Metric name must be a string"
 
-    if not isinstance(value, (int, float)):
+    if type(value) not in _EXACT_NUMBER_TYPES and not isinstance(value, _NUMBER_TYPES):
         return False, "Metric value must be a number"
 
     if tags and not isinstance(tags, dict):
@@ -30,7 +37,7 @@ def validate_evaluation_result(
     if not test_case_id:
         return False, "Test case ID is required"
 
-    if not isinstance(score, (int, float)):
+    if type(score) not in _EXACT_NUMBER_TYPES and not isinstance(score, _NUMBER_TYPES):
         return False, "Score must be a number"
 
     if not (0 <= score <= 1):
@@ -47,7 +54,7 @@ def validate_agent_execution(
     if not agent_id:
         return False, "Agent ID is required"
 
-    if not isinstance(duration_ms, (int, float)):
+    if type(duration_ms) not in _EXACT_NUMBER_TYPES and not isinstance(duration_ms, _NUMBER_TYPES):
         return False, "Duration must be a number"
 
     if duration_ms < 0:
@@ -74,11 +81,10 @@ def validate_alert_rule(rule_id: str, metric_name: str, threshold: float, severi
     if not metric_name:
         return False, "Metric name is required"
 
-    if not isinstance(threshold, (int, float)):
+    if type(threshold) not in _EXACT_NUMBER_TYPES and not isinstance(threshold, _NUMBER_TYPES):
         return False, "Threshold must be a number"
 
-    valid_severities = ["info", "warning", "error", "critical"]
-    if severity not in valid_severities:
-        return False, f"Severity must be one of {valid_severities}"
+    if severity not in _VALID_SEVERITIES:
+        return False, f"Severity must be one of {_VALID_SEVERITIES}"
 
     return True, None